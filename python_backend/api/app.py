@@ -4,8 +4,11 @@ FastAPI application for RFQ processing platform.
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+import atexit
 import os
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,8 +18,27 @@ from .routes import router
 from ..models.database import create_tables
 from ..models.sample_data import create_sample_data
 
+def configure_queue_logging():
+    """Route root log records through a queue drained by a background thread.
+    
+    Request handlers then only enqueue records instead of writing to stderr
+    under the handler lock, which matters when many concurrent AI calls fail
+    at once.
+    """
+    root = logging.getLogger()
+    if any(isinstance(handler, QueueHandler) for handler in root.handlers):
+        return
+    
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    atexit.register(listener.stop)
+
 def create_app():
     """Create and configure the FastAPI application"""
+    configure_queue_logging()
+    
     try:
         # Create database tables
         logger.info("Creating database tables if they don't exist")
@@ -8,6 +8,7 @@ with specialized handling for AI hardware procurement.
 from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, Query
 from fastapi.responses import JSONResponse
 from typing import List, Optional, Dict, Any
+import asyncio
 import json
 import os
 import shutil
@@ -30,9 +31,22 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter()
 
+# Shared so its website and sanctions caches last across requests
+compliance_service = ComplianceService()
+
 # Ensure uploads directory exists
 os.makedirs("uploads", exist_ok=True)
 
+# Where each comparable performance metric lives on a product: (spec group, field)
+PERFORMANCE_METRIC_FIELDS = {
+    "fp32": ("computeSpecs", "fp32Performance"),
+    "fp16": ("computeSpecs", "fp16Performance"),
+    "int8": ("computeSpecs", "int8Performance"),
+    "memory_bandwidth": ("memorySpecs", "bandwidth"),
+    "memory_capacity": ("memorySpecs", "capacity"),
+    "tdp": ("powerConsumption", "tdp"),
+}
+
 @router.get("/rfqs", response_model=List[RFQResponse])
 async def get_rfqs():
     """Get all RFQs"""
@@ -118,8 +132,7 @@ async def upload_rfq(file: UploadFile = File(...)):
             "extractedRequirements": rfq.extractedRequirements
         }
     except Exception as e:
-        # Log the error
-        print(f"Error processing uploaded file: {str(e)}")
+        logger.exception(f"Error processing uploaded file: {str(e)}")
         
         # Create a fallback RFQ with mock data for demo purposes
         mock_requirements = {
@@ -184,9 +197,6 @@ async def upload_rfq(file: UploadFile = File(...)):
 @router.post("/rfqs", response_model=Dict[str, Any])
 async def create_rfq(rfq_request: RFQUploadRequest):
     """Create RFQ manually with specifications"""
-    import logging
-    logger = logging.getLogger(__name__)
-    
     try:
         logger.info(f"Received manual RFQ creation request: {rfq_request}")
         
@@ -367,10 +377,11 @@ async def check_compliance(buyer_country: str, product_id: int):
         # Check shipping restrictions
         compliance_result = check_product_shipping_restrictions(product_dict, buyer_country)
         
-        # Get detailed compliance report
-        compliance_service = ComplianceService()
+        # Get detailed compliance report; it may fetch the supplier's website,
+        # so run it off the event loop to keep other requests moving
         buyer = {"country": buyer_country}
-        compliance_report = compliance_service.generate_compliance_report(
+        compliance_report = await asyncio.to_thread(
+            compliance_service.generate_compliance_report,
             buyer,
             supplier.dict() if hasattr(supplier, "dict") else vars(supplier),
             product_dict
@@ -411,7 +422,7 @@ async def check_frameworks_compatibility(product_id: int, frameworks: List[str]
             if isinstance(specifications, str):
                 try:
                     specifications = json.loads(specifications)
-                except:
+                except ValueError:
                     specifications = {}
             
             supported_frameworks = specifications.get("supportedFrameworks", [])
@@ -457,14 +468,12 @@ async def check_frameworks_compatibility(product_id: int, frameworks: List[str]
 async def compare_hardware_performance(product_ids: List[int] = Query(...), metric: str = "fp32"):
     """Compare performance metrics of multiple AI hardware products"""
     try:
-        # Valid performance metrics
-        valid_metrics = ["fp32", "fp16", "int8", "memory_bandwidth", "memory_capacity", "tdp"]
-        
-        if metric not in valid_metrics:
+        if metric not in PERFORMANCE_METRIC_FIELDS:
             raise HTTPException(
                 status_code=400, 
-                detail=f"Invalid metric. Valid options are: {', '.join(valid_metrics)}"
+                detail=f"Invalid metric. Valid options are: {', '.join(PERFORMANCE_METRIC_FIELDS)}"
             )
+        spec_group, spec_field = PERFORMANCE_METRIC_FIELDS[metric]
         
         # Get the products
         products = []
@@ -482,44 +491,17 @@ async def compare_hardware_performance(product_ids: List[int] = Query(...), metr
             # Convert product to dict
             product_dict = product.dict() if hasattr(product, "dict") else vars(product)
             
-            # Extract compute specs
-            compute_specs = product_dict.get("computeSpecs", {})
-            memory_specs = product_dict.get("memorySpecs", {})
-            power_specs = product_dict.get("powerConsumption", {})
+            # Only the spec group holding the requested metric is needed
+            specs = product_dict.get(spec_group) or {}
             
             # If specs are stored as strings, convert to dict
-            if isinstance(compute_specs, str):
-                try:
-                    compute_specs = json.loads(compute_specs)
-                except:
-                    compute_specs = {}
-            
-            if isinstance(memory_specs, str):
-                try:
-                    memory_specs = json.loads(memory_specs)
-                except:
-                    memory_specs = {}
-            
-            if isinstance(power_specs, str):
+            if isinstance(specs, str):
                 try:
-                    power_specs = json.loads(power_specs)
-                except:
-                    power_specs = {}
+                    specs = json.loads(specs)
+                except ValueError:
+                    specs = {}
             
-            # Extract metric value
-            metric_value = None
-            if metric == "fp32":
-                metric_value = compute_specs.get("fp32Performance", 0)
-            elif metric == "fp16":
-                metric_value = compute_specs.get("fp16Performance", 0)
-            elif metric == "int8":
-                metric_value = compute_specs.get("int8Performance", 0)
-            elif metric == "memory_bandwidth":
-                metric_value = memory_specs.get("bandwidth", 0)
-            elif metric == "memory_capacity":
-                metric_value = memory_specs.get("capacity", 0)
-            elif metric == "tdp":
-                metric_value = power_specs.get("tdp", 0)
+            metric_value = specs.get(spec_field, 0)
             
             performance_data.append({
                 "id": product.id,
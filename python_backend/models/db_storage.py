@@ -1,5 +1,5 @@
-from typing import List, Dict, Optional, Any
-from sqlalchemy.orm import Session
+from typing import List, Dict, Optional, Any, Tuple
+from sqlalchemy.orm import Session, joinedload
 import json
 from datetime import datetime
 
@@ -274,6 +274,44 @@ class DatabaseStorage:
             for db_product in db_products
         ]
     
+    async def get_products_with_suppliers_by_category(self, category: str) -> List[Tuple[Product, Optional[Supplier]]]:
+        """Get all products by category together with their suppliers, in one query"""
+        db = next(get_db())
+        db_products = (
+            db.query(DBProduct)
+            .options(joinedload(DBProduct.supplier))
+            .filter(DBProduct.category.ilike(f"%{category}%"))
+            .all()
+        )
+        
+        return [
+            (
+                Product(
+                    id=db_product.id,
+                    supplierId=db_product.supplier_id,
+                    name=db_product.name,
+                    category=db_product.category,
+                    description=db_product.description or "",
+                    price=db_product.price,
+                    specifications=db_product.specifications,
+                    warranty=db_product.warranty or ""
+                ),
+                Supplier(
+                    id=db_product.supplier.id,
+                    name=db_product.supplier.name,
+                    logoUrl=db_product.supplier.logo_url or "",
+                    website=db_product.supplier.website or "",
+                    country=db_product.supplier.country or "",
+                    description=db_product.supplier.description or "",
+                    contactEmail=db_product.supplier.contact_email or "",
+                    contactPhone=db_product.supplier.contact_phone or "",
+                    deliveryTime=db_product.supplier.delivery_time or "",
+                    isVerified=db_product.supplier.is_verified
+                ) if db_product.supplier else None
+            )
+            for db_product in db_products
+        ]
+    
     async def create_proposal(self, proposal_data: dict) -> Proposal:
         """Create a new proposal"""
         db = next(get_db())
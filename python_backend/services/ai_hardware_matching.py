@@ -9,7 +9,7 @@ and compliance with export regulations.
 import re
 import logging
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Dict, Any, Tuple, Optional, Set, Union
 
 from ..models.db_storage import DatabaseStorage
@@ -660,7 +660,7 @@ def calculate_match_score(
     
     return overall_score, score_details
 
-async def get_quantity_for_category(requirements: Any, category: str) -> int:
+def get_quantity_for_category(requirements: Any, category: str) -> int:
     """
     Get quantity from requirements for a specific category
     
@@ -697,7 +697,7 @@ async def get_quantity_for_category(requirements: Any, category: str) -> int:
     # If we can't determine quantity, default to 1
     return 1
 
-async def calculate_price_score(product: Product, all_products: List[Product], criteria: Dict[str, Dict[str, int]]) -> float:
+def calculate_price_score(product: Product, all_products: List[Product], criteria: Dict[str, Dict[str, int]]) -> float:
     """
     Calculate price score compared to other products in the same category
     
@@ -887,7 +887,7 @@ async def match_suppliers_for_rfq(rfq_id: int) -> List[SupplierMatch]:
         if isinstance(requirements, str):
             try:
                 requirements = json.loads(requirements)
-            except:
+            except ValueError:
                 logger.error(f"Failed to parse requirements for RFQ {rfq_id}")
                 return []
         
@@ -964,7 +964,7 @@ async def match_suppliers_for_rfq(rfq_id: int) -> List[SupplierMatch]:
                     
                     # Calculate total price based on quantity
                     try:
-                        quantity = await get_quantity_for_category(requirements, category)
+                        quantity = get_quantity_for_category(requirements, category)
                         total_price = product.price * quantity
                     except Exception as e:
                         logger.error(f"Error calculating quantity: {str(e)}")
@@ -980,7 +980,6 @@ async def match_suppliers_for_rfq(rfq_id: int) -> List[SupplierMatch]:
                     
                     estimated_delivery = datetime.now().strftime("%Y-%m-%d")
                     try:
-                        from datetime import timedelta
                         estimated_delivery = (datetime.now() + timedelta(days=delivery_days)).strftime("%Y-%m-%d")
                     except Exception as e:
                         logger.error(f"Error calculating estimated delivery: {str(e)}")
@@ -3,161 +3,679 @@
 AI service for processing RFQ documents and extracting requirements.
 """
 
+import asyncio
+import functools
+import hashlib
 import json
 import logging
 import os
-from typing import Dict, Any, Optional
-from openai import OpenAI
-from ..models.schemas import ExtractedRequirement
+import re
+import string
+from collections import OrderedDict
+from typing import Callable, Dict, Any, List, Optional, Tuple, TypeVar
+import httpx
+from openai import AsyncOpenAI, OpenAIError
+from pydantic import TypeAdapter, ValidationError
+from ..models.schemas import EmailTemplate, ExtractedRequirement, LaptopRequirements, MonitorRequirements
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-def get_openai_client():
-    """Get OpenAI client with proper API key handling"""
-    api_key = os.getenv("FEATHERLESS_API_KEY") or os.getenv("OPENAI_API_KEY")
+# Chat models served by both Featherless and OpenAI-compatible endpoints. Single
+# RFQs and emails go to the fast model first and only escalate to AI_MODEL when
+# its reply does not parse; multi-RFQ batches go straight to AI_MODEL
+AI_MODEL = "Qwen/Qwen2.5-32B-Instruct"
+AI_MODEL_FAST = "Qwen/Qwen2.5-7B-Instruct"
+FEATHERLESS_BASE_URL = "https://api.featherless.ai/v1"
+
+# Replies are constrained to a JSON schema (OpenAI structured outputs, vLLM
+# guided decoding on Featherless) so they parse on the first attempt; the caps
+# bound the generated tokens
+def _json_schema_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Build an OpenAI-compatible response_format for a JSON schema"""
+    return {"type": "json_schema", "json_schema": {"name": name, "schema": schema}}
+
+_REQUIREMENT_SCHEMA = ExtractedRequirement.model_json_schema()
+_EXTRACTION_RESPONSE_FORMAT = _json_schema_format("extracted_requirement", _REQUIREMENT_SCHEMA)
+_BATCH_EXTRACTION_RESPONSE_FORMAT = _json_schema_format("extracted_requirements", {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {k: v for k, v in _REQUIREMENT_SCHEMA.items() if k != "$defs"}
+        }
+    },
+    "required": ["results"],
+    # Nested model definitions must live at the root for "#/$defs/..." refs
+    "$defs": _REQUIREMENT_SCHEMA.get("$defs", {})
+})
+_EMAIL_SCHEMA = {
+    "type": "object",
+    "properties": {"subject": {"type": "string"}, "body": {"type": "string"}},
+    "required": ["subject", "body"]
+}
+_EMAIL_RESPONSE_FORMAT = _json_schema_format("proposal_email", _EMAIL_SCHEMA)
+_MULTI_EMAIL_RESPONSE_FORMAT = _json_schema_format("proposal_emails", {
+    "type": "object",
+    "properties": {"emails": {"type": "array", "items": _EMAIL_SCHEMA}},
+    "required": ["emails"]
+})
+
+# Batched replies are decoded and validated by pydantic-core in one pass, with
+# no intermediate dicts or per-item model construction in Python
+_BATCH_RESULTS_ADAPTER = TypeAdapter(Dict[str, List[ExtractedRequirement]])
+_MULTI_EMAIL_ADAPTER = TypeAdapter(Dict[str, List[Dict[str, str]]])
+
+_EXTRACTION_MAX_TOKENS = 800
+_EMAIL_MAX_TOKENS = 600
+
+# Product specification fields worth mentioning in a proposal email; everything
+# else is left out of the prompt to keep token counts down
+_SPEC_ALLOWLIST = frozenset({
+    "processor", "memory", "storage", "display",
+    "screenSize", "resolution", "panelTech",
+    "Memory Size", "Memory Bandwidth", "TDP",
+})
+
+def _compact_specs(specs: Any) -> str:
+    """Serialize the allowlisted product specifications as compact JSON"""
+    if not isinstance(specs, dict):
+        return "{}"
+    compact = {k: v for k, v in specs.items() if k in _SPEC_ALLOWLIST}
+    return json.dumps(compact, sort_keys=True, separators=(",", ":"))
+
+# "Title: ..." line of an RFQ, used to name the fallback requirements
+_TITLE_RE = re.compile(r"Title:?[ \t]*([^\n]+)")
+
+# Category keywords recognised by the fallback, matched in a single pass
+_CATEGORY_KEYWORDS_RE = re.compile(r"laptop|notebook|monitor", re.IGNORECASE)
+_KEYWORD_CATEGORIES = {"laptop": "Laptops", "notebook": "Laptops", "monitor": "Monitors"}
+
+# Models sometimes wrap their JSON answer in a markdown code fence
+_JSON_FENCE_RE = re.compile(r"^```[A-Za-z]*\n?|\n?```$")
+
+def _strip_json_fence(text: str) -> str:
+    """Remove a markdown code fence around a JSON model response"""
+    return _JSON_FENCE_RE.sub("", text.strip())
+
+def _parse_json_response(text: str) -> Any:
+    """Parse a JSON model response, tolerating a surrounding markdown code fence"""
+    return json.loads(_strip_json_fence(text))
+
+# System prompts are fixed, so build them once rather than on every request.
+# They must stay byte-identical and lead the message list: OpenAI and vLLM-based
+# providers (Featherless) reuse the cached prefill for a repeated prompt prefix,
+# which is also why the batch prompt extends the single-RFQ one
+_EXTRACTION_SYSTEM_PROMPT = """\
+You are an expert procurement analyst specializing in extracting structured requirements from RFQ documents.
+
+Analyze the provided RFQ content and extract key information in JSON format.
+
+Focus on these areas:
+- title: Brief descriptive title
+- description: Summary of what's being procured
+- categories: Types of equipment/services needed
+- quantity: Number of units
+- technical_specifications: Detailed requirements
+- criteria: Evaluation criteria with weights (price, quality, delivery)
+- timeline: Delivery or project timeline
+
+For AI hardware RFQs, also extract:
+- compute_requirements: Performance needs (FLOPS, memory, etc.)
+- frameworks: Required ML/AI frameworks
+- compliance: Export control or regulatory requirements
+"""
+
+_BATCH_EXTRACTION_SYSTEM_PROMPT = _EXTRACTION_SYSTEM_PROMPT + """
+You will receive several RFQs, numbered "RFQ 1", "RFQ 2" and so on.
+Return {"results": [...]} with one requirements object per RFQ, in the same order.
+"""
+
+_EMAIL_SYSTEM_PROMPT = """\
+Generate a professional email proposal for a supplier responding to an RFQ.
+The email should be formal, detailed, and persuasive.
+
+Include:
+- Professional greeting and introduction
+- Reference to the RFQ and understanding of requirements
+- Product/service highlights that match the requirements
+- Competitive advantages and value proposition
+- Next steps and contact information
+
+Return JSON with: {"subject": "...", "body": "..."}
+"""
+
+_MULTI_EMAIL_SYSTEM_PROMPT = _EMAIL_SYSTEM_PROMPT + """
+You will receive several numbered suppliers offering the same product.
+Return {"emails": [...]} with one {"subject", "body"} email per supplier, in the same order.
+"""
+
+_EMAIL_CONTEXT_TEMPLATE = """\
+RFQ Details:
+Title: {rfq[title]}
+Description: {rfq[description]}
+
+Product Details:
+Name: {product[name]}
+Price: ${product[price]}
+Warranty: {product[warranty]}
+Key Specifications: {specs}
+"""
+
+_EMAIL_USER_TEMPLATE = _EMAIL_CONTEXT_TEMPLATE + """
+Supplier Details:
+Name: {supplier[name]}
+Contact: {supplier[contactEmail]}
+"""
+
+# Proposals for the same product only differ in the supplier, so the RFQ and
+# product context is sent once with all suppliers listed underneath
+_MULTI_EMAIL_USER_TEMPLATE = _EMAIL_CONTEXT_TEMPLATE + """
+Suppliers:
+{suppliers}
+"""
+_MULTI_EMAIL_SUPPLIER_LINE = "{n}. Name: {supplier[name]}, Contact: {supplier[contactEmail]}"
+
+# Products with more suppliers than this are written up in a single request
+_MIN_SUPPLIERS_PER_MULTI_EMAIL = 3
+
+class _WithDefault(dict):
+    """Mapping used to fill prompt templates; missing fields render as N/A"""
+    def __missing__(self, key: str) -> str:
+        return "N/A"
+
+# Generated proposals are reused when the same RFQ/product/supplier data is
+# rendered again (preview, edit, re-send); least recently used entries go first
+_EMAIL_CACHE_SIZE = 256
+_email_cache: "OrderedDict[str, EmailTemplate]" = OrderedDict()
+
+def _payload_key(*payload: Any) -> str:
+    """Stable digest of JSON-serializable inputs, used as a cache key"""
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def _cache_get(cache: OrderedDict, key: str) -> Optional[Any]:
+    """Return a cached value and mark it as recently used"""
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+def _cache_put(cache: OrderedDict, key: str, value: Any, maxsize: int) -> None:
+    """Store a value, evicting the least recently used entry when full"""
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > maxsize:
+        cache.popitem(last=False)
+
+# Extractions of previously seen RFQ documents, keyed by content digest, and
+# the locks that let concurrent submissions of one document share a call
+_EXTRACTION_CACHE_SIZE = 1024
+_extraction_cache: "OrderedDict[str, ExtractedRequirement]" = OrderedDict()
+_extraction_locks: Dict[str, asyncio.Lock] = {}
+
+# Upper bound on model requests in flight for one batch extraction or
+# proposal fan-out
+_MAX_CONCURRENT_REQUESTS = 4
+
+# Long RFQs (PDF exports with boilerplate terms and conditions) are cut down to
+# this many characters before they are sent, keeping the relevant paragraphs
+_MAX_RFQ_CHARS = 12000
+_RELEVANT_TERMS_RE = re.compile(
+    r"\b(?:requirement|spec|quantit|warrant|criteri|award|deliver|laptop|notebook|monitor)",
+    re.IGNORECASE
+)
+
+# Batched extraction shares one system prompt across several RFQs; the
+# character cap keeps a batch comfortably inside the model context
+_MAX_BATCH_CHARS = 24000
+
+# One connection pool shared by every AI client, so consecutive calls reuse
+# open TLS connections instead of handshaking each time
+_http_client: Optional[httpx.AsyncClient] = None
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client for AI provider calls, creating it on first use"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=60.0
+        )
+    return _http_client
+
+# Generic proposal used when no AI provider is available or generation fails
+_FALLBACK_EMAIL_SUBJECT = string.Template("Proposal for $title")
+_FALLBACK_EMAIL_BODY = string.Template(
+    "Dear Procurement Team,\n\n"
+    "We are pleased to submit our proposal for your recent RFQ.\n\n"
+    "Best regards,\n"
+    "$supplier_name"
+)
+
+# How often the fast model's replies needed the strong model; a high rate means
+# the fast model is costing more than it saves
+_ESCALATION_WARN_RATE = 0.05
+_ESCALATION_MIN_CALLS = 20
+_escalation_stats = {"calls": 0, "escalations": 0}
+
+T = TypeVar("T")
+
+# What a malformed model reply raises while being parsed; ValueError covers
+# both JSON decode and pydantic validation errors
+_MALFORMED_REPLY_ERRORS = (ValueError, KeyError, TypeError)
+
+# Failures of a model call that should end in a fallback rather than an error:
+# API and network errors (the client wraps httpx errors), timeouts and
+# malformed replies. Anything else is a bug and propagates
+_AI_CALL_ERRORS = (OpenAIError, asyncio.TimeoutError) + _MALFORMED_REPLY_ERRORS
+
+def _reply_text(response: Any) -> str:
+    """Get the text of a chat completion, raising ValueError when there is none
+    (no choices, or a refusal or content filter leaving the content empty) so
+    the reply is handled like any other malformed one"""
+    if not response.choices or not response.choices[0].message.content:
+        raise ValueError("model reply has no content")
+    return response.choices[0].message.content
+
+async def _complete_with_escalation(client: AsyncOpenAI, parse: Callable[[str], T], **request: Any) -> T:
+    """Run a chat completion on the fast model and parse it, retrying once on
+    the strong model if the reply does not parse"""
+    _escalation_stats["calls"] += 1
+    response = await client.chat.completions.create(model=AI_MODEL_FAST, **request)
+    try:
+        return parse(_reply_text(response))
+    except _MALFORMED_REPLY_ERRORS as e:
+        logger.info(f"Fast model reply did not parse, retrying with {AI_MODEL}: {str(e)}")
     
-    if not api_key:
-        raise ValueError("No API key found. Please set FEATHERLESS_API_KEY or OPENAI_API_KEY environment variable.")
+    _escalation_stats["escalations"] += 1
+    calls, escalations = _escalation_stats["calls"], _escalation_stats["escalations"]
+    if calls >= _ESCALATION_MIN_CALLS and escalations / calls > _ESCALATION_WARN_RATE:
+        logger.warning(f"{escalations} of {calls} fast model replies needed escalation to {AI_MODEL}")
     
+    response = await client.chat.completions.create(model=AI_MODEL, **request)
+    return parse(_reply_text(response))
+
+# Initialize OpenAI client
+@functools.lru_cache(maxsize=4)
+def _build_openai_client(api_key: str) -> AsyncOpenAI:
+    """Create the AI client for an API key; cached so every call reuses one client"""
     # Use Featherless AI endpoint if using their key
     if api_key.startswith("rc_"):
-        client = OpenAI(
+        logger.info("Using Featherless AI for requirement extraction")
+        return AsyncOpenAI(
             api_key=api_key,
-            base_url="https://api.featherless.ai/v1"
+            base_url=FEATHERLESS_BASE_URL,
+            http_client=_get_http_client()
         )
-        logger.info("Using Featherless AI for requirement extraction")
-    else:
-        client = OpenAI(api_key=api_key)
-        logger.info("Using OpenAI for requirement extraction")
     
-    return client
+    logger.info("Using OpenAI for requirement extraction")
+    return AsyncOpenAI(api_key=api_key, http_client=_get_http_client())
+
+def get_openai_client() -> Optional[AsyncOpenAI]:
+    """Get OpenAI client with proper API key handling, or None if no key is configured"""
+    # The key is read on every call, not at import, so a rotated key is picked
+    # up and importing this module never touches the environment
+    api_key = os.getenv("FEATHERLESS_API_KEY") or os.getenv("OPENAI_API_KEY")
+    
+    if not api_key:
+        logger.warning("No API key found. Set FEATHERLESS_API_KEY or OPENAI_API_KEY to enable AI features.")
+        return None
+    
+    return _build_openai_client(api_key)
+
+def _trim_rfq(content: str, max_chars: int = _MAX_RFQ_CHARS) -> str:
+    """Shorten an RFQ that is too long for the prompt, keeping the paragraphs
+    that mention requirements the most, in their original order"""
+    if len(content) <= max_chars:
+        return content
+    
+    paragraphs = content.split("\n\n")
+    # sorted() is stable, so equally relevant paragraphs keep document order
+    ranked = sorted(
+        range(len(paragraphs)),
+        key=lambda i: len(_RELEVANT_TERMS_RE.findall(paragraphs[i])),
+        reverse=True
+    )
+    keep = set()
+    used = 0
+    for i in ranked:
+        size = len(paragraphs[i]) + 2
+        if used + size <= max_chars:
+            keep.add(i)
+            used += size
+    
+    if not keep:
+        return content[:max_chars]
+    return "\n\n".join(paragraph for i, paragraph in enumerate(paragraphs) if i in keep)
+
+def _content_key(content: str) -> str:
+    """Cache key for a normalized RFQ document"""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+def _remember_requirements(content: str, requirement: ExtractedRequirement) -> None:
+    """Cache a successful extraction; a copy is stored because callers edit the result"""
+    _cache_put(_extraction_cache, _content_key(content), requirement.model_copy(deep=True), _EXTRACTION_CACHE_SIZE)
+
+def _parse_requirements(text: str) -> ExtractedRequirement:
+    """Decode a requirements reply straight into the model; pydantic-core parses
+    the JSON itself, so no intermediate dict is built"""
+    logger.info(f"AI extracted content: {text}")
+    return ExtractedRequirement.model_validate_json(_strip_json_fence(text))
+
+async def _request_requirements(client: AsyncOpenAI, content: str) -> Optional[ExtractedRequirement]:
+    """Ask the model for the requirements of one RFQ, or None if that fails"""
+    try:
+        return await _complete_with_escalation(
+            client,
+            _parse_requirements,
+            messages=[
+                {"role": "system", "content": _EXTRACTION_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Extract requirements from this RFQ:\n\n{_trim_rfq(content)}"}
+            ],
+            temperature=0,
+            max_tokens=_EXTRACTION_MAX_TOKENS,
+            response_format=_EXTRACTION_RESPONSE_FORMAT
+        )
+    except ValidationError as e:
+        logger.error(f"AI response is not valid requirements JSON: {e}")
+        return None
+    except _AI_CALL_ERRORS as e:
+        logger.error(f"Error in AI requirement extraction: {str(e)}")
+        return None
 
 async def extract_requirements_from_rfq(content: str) -> ExtractedRequirement:
     """Extract structured requirements from RFQ content using AI."""
     
-    if not content or len(content.strip()) < 10:
+    # Normalize once; the stripped text is also what gets sent to the model
+    content = content.strip() if content else ""
+    if len(content) < 10:
         logger.warning("Content too short or empty, using fallback requirements")
-        return _get_fallback_requirements()
+        return _get_fallback_requirements(content)
+    
+    key = _content_key(content)
+    cached = _cache_get(_extraction_cache, key)
+    if cached is not None:
+        return cached.model_copy(deep=True)
+    
+    client = get_openai_client()
+    if client is None:
+        return _get_fallback_requirements(content)
     
+    # Concurrent submissions of the same document share a single model call
+    lock = _extraction_locks.setdefault(key, asyncio.Lock())
     try:
-        client = get_openai_client()
-        
-        system_prompt = """
-        You are an expert procurement analyst specializing in extracting structured requirements from RFQ documents.
-        
-        Analyze the provided RFQ content and extract key information in JSON format.
-        
-        Focus on these areas:
-        - title: Brief descriptive title
-        - description: Summary of what's being procured  
-        - categories: Types of equipment/services needed
-        - quantity: Number of units
-        - technical_specifications: Detailed requirements
-        - criteria: Evaluation criteria with weights (price, quality, delivery)
-        - timeline: Delivery or project timeline
-        
-        For AI hardware RFQs, also extract:
-        - compute_requirements: Performance needs (FLOPS, memory, etc.)
-        - frameworks: Required ML/AI frameworks
-        - compliance: Export control or regulatory requirements
-        
-        Return ONLY valid JSON with no additional text.
-        """
-        
-        response = client.chat.completions.create(
-            model="Qwen/Qwen2.5-32B-Instruct",
+        async with lock:
+            cached = _cache_get(_extraction_cache, key)
+            if cached is not None:
+                return cached.model_copy(deep=True)
+            
+            requirement = await _request_requirements(client, content)
+            if requirement is None:
+                return _get_fallback_requirements(content)
+            
+            _remember_requirements(content, requirement)
+            return requirement
+    finally:
+        if _extraction_locks.get(key) is lock and not lock.locked():
+            del _extraction_locks[key]
+
+def _group_for_batching(contents: List[str], batch_size: int) -> List[List[int]]:
+    """Group RFQ indices so each model call carries at most batch_size RFQs and
+    _MAX_BATCH_CHARS characters; an oversized RFQ gets a call of its own"""
+    groups: List[List[int]] = []
+    current: List[int] = []
+    current_chars = 0
+    for index, content in enumerate(contents):
+        if current and (len(current) >= batch_size or current_chars + len(content) > _MAX_BATCH_CHARS):
+            groups.append(current)
+            current, current_chars = [], 0
+        current.append(index)
+        current_chars += len(content)
+    if current:
+        groups.append(current)
+    return groups
+
+async def _extract_requirements_group(client: AsyncOpenAI, contents: List[str]) -> List[ExtractedRequirement]:
+    """Extract requirements for several RFQs with a single model call"""
+    if len(contents) == 1:
+        return [await extract_requirements_from_rfq(contents[0])]
+    
+    user_content = "\n\n".join(f"RFQ {n}:\n{_trim_rfq(content)}" for n, content in enumerate(contents, 1))
+    try:
+        response = await client.chat.completions.create(
+            model=AI_MODEL,
             messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Extract requirements from this RFQ:\n\n{content}"}
+                {"role": "system", "content": _BATCH_EXTRACTION_SYSTEM_PROMPT},
+                {"role": "user", "content": user_content}
             ],
-            temperature=0.2,
-            max_tokens=2000
+            temperature=0,
+            max_tokens=_EXTRACTION_MAX_TOKENS * len(contents),
+            response_format=_BATCH_EXTRACTION_RESPONSE_FORMAT
         )
         
-        extracted_content = response.choices[0].message.content
-        logger.info(f"AI extracted content: {extracted_content}")
-        
-        # Parse JSON response
-        try:
-            extracted_data = json.loads(extracted_content)
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse AI response as JSON: {e}")
-            return _get_fallback_requirements()
-        
-        # Convert to ExtractedRequirement object
-        return ExtractedRequirement(**extracted_data)
-        
-    except Exception as e:
-        logger.error(f"Error in AI requirement extraction: {str(e)}")
-        return _get_fallback_requirements()
+        extracted = _BATCH_RESULTS_ADAPTER.validate_json(_strip_json_fence(_reply_text(response)))["results"]
+        if len(extracted) != len(contents):
+            raise ValueError(f"expected {len(contents)} results, got {len(extracted)}")
+        for content, requirement in zip(contents, extracted):
+            _remember_requirements(content, requirement)
+        return extracted
+    
+    except _AI_CALL_ERRORS as e:
+        # One malformed answer should not cost the whole batch its results
+        logger.warning(f"Batched extraction failed, retrying RFQs one by one: {str(e)}")
+        return [await extract_requirements_from_rfq(content) for content in contents]
 
-def _get_fallback_requirements() -> ExtractedRequirement:
+async def extract_requirements_batch(contents: List[str], batch_size: int = 4) -> List[ExtractedRequirement]:
+    """Extract requirements from several RFQs, in input order."""
+    contents = [content.strip() if content else "" for content in contents]
+    results: List[ExtractedRequirement] = [_get_fallback_requirements(content) for content in contents]
+    
+    client = get_openai_client()
+    if client is None:
+        return results
+    
+    # Too-short RFQs keep the fallback, as in extract_requirements_from_rfq,
+    # and documents extracted before are served from the cache
+    pending = []
+    for i, content in enumerate(contents):
+        if len(content) < 10:
+            continue
+        cached = _cache_get(_extraction_cache, _content_key(content))
+        if cached is not None:
+            results[i] = cached.model_copy(deep=True)
+        else:
+            pending.append(i)
+    groups = _group_for_batching([_trim_rfq(contents[i]) for i in pending], batch_size)
+    
+    # Extraction waits on the model, not the CPU, so overlapping requests is
+    # what speeds up bulk imports; the semaphore keeps us within rate limits
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+    
+    async def extract(group: List[int]) -> None:
+        indices = [pending[i] for i in group]
+        async with semaphore:
+            extracted = await _extract_requirements_group(client, [contents[i] for i in indices])
+        for index, requirement in zip(indices, extracted):
+            results[index] = requirement
+    
+    await asyncio.gather(*(extract(group) for group in groups))
+    return results
+
+# Template for fallback requirements, validated once at import; each fallback
+# is a deep copy with the RFQ-specific fields filled in
+_FALLBACK_REQUIREMENTS = ExtractedRequirement(
+    title="General Equipment Procurement",
+    description="Equipment procurement requirements",
+    categories=["General Equipment"],
+    criteria={
+        "price": {"weight": 40},
+        "quality": {"weight": 40},
+        "delivery": {"weight": 20}
+    }
+)
+
+def _get_fallback_requirements(content: str = "") -> ExtractedRequirement:
     """Return fallback requirements when AI extraction fails"""
-    return ExtractedRequirement(
-        title="General Equipment Procurement",
-        description="Equipment procurement requirements",
-        categories=["General Equipment"],
-        quantity=1,
-        technical_specifications="Standard specifications as per requirements",
-        criteria={
-            "price": {"weight": 40},
-            "quality": {"weight": 40},
-            "delivery": {"weight": 20}
-        }
-    )
+    title_match = _TITLE_RE.search(content)
+    title = title_match.group(1).strip() if title_match else ""
+    
+    categories = []
+    for match in _CATEGORY_KEYWORDS_RE.finditer(content):
+        category = _KEYWORD_CATEGORIES[match.group().lower()]
+        if category not in categories:
+            categories.append(category)
+            if len(categories) == 2:  # both categories found, stop scanning
+                break
+    
+    update: Dict[str, Any] = {}
+    if title:
+        update["title"] = title
+    if categories:
+        update["categories"] = categories
+    if "Laptops" in categories:
+        update["laptops"] = LaptopRequirements()
+    if "Monitors" in categories:
+        update["monitors"] = MonitorRequirements()
+    return _FALLBACK_REQUIREMENTS.model_copy(update=update, deep=True)
 
-async def generate_email_proposal(rfq_data: Dict[str, Any], product_data: Dict[str, Any], supplier_data: Dict[str, Any]) -> Dict[str, str]:
+async def generate_email_proposal(rfq_data: Dict[str, Any], product_data: Dict[str, Any], supplier_data: Dict[str, Any]) -> EmailTemplate:
     """Generate professional email proposal for supplier"""
     
+    cache_key = _payload_key(rfq_data, product_data, supplier_data)
+    cached = _cache_get(_email_cache, cache_key)
+    if cached is not None:
+        return cached.model_copy()
+    
+    client = get_openai_client()
+    if client is None:
+        return _get_fallback_email(rfq_data, supplier_data)
+    
     try:
-        client = get_openai_client()
-        
-        system_prompt = """
-        Generate a professional email proposal for a supplier responding to an RFQ.
-        The email should be formal, detailed, and persuasive.
+        user_content = _EMAIL_USER_TEMPLATE.format_map({
+            "rfq": _WithDefault(rfq_data),
+            "product": _WithDefault(product_data),
+            "supplier": _WithDefault(supplier_data),
+            "specs": _compact_specs(product_data.get("specifications")),
+        })
         
-        Include:
-        - Professional greeting and introduction
-        - Reference to the RFQ and understanding of requirements
-        - Product/service highlights that match the requirements
-        - Competitive advantages and value proposition
-        - Next steps and contact information
+        def parse_email(text: str) -> EmailTemplate:
+            result = _parse_json_response(text)
+            return EmailTemplate(
+                to=supplier_data.get('contactEmail', ''),
+                subject=result["subject"],
+                body=result["body"]
+            )
         
-        Return JSON with: {"subject": "...", "body": "..."}
-        """
-        
-        user_content = f"""
-        RFQ Details:
-        Title: {rfq_data.get('title', 'N/A')}
-        Description: {rfq_data.get('description', 'N/A')}
+        email = await _complete_with_escalation(
+            client,
+            parse_email,
+            messages=[
+                {"role": "system", "content": _EMAIL_SYSTEM_PROMPT},
+                {"role": "user", "content": user_content}
+            ],
+            temperature=0.3,
+            max_tokens=_EMAIL_MAX_TOKENS,
+            response_format=_EMAIL_RESPONSE_FORMAT
+        )
         
-        Product Details:
-        Name: {product_data.get('name', 'N/A')}
-        Price: ${product_data.get('price', 'N/A')}
+        # Only model output is cached so a transient failure is retried next time
+        _cache_put(_email_cache, cache_key, email.model_copy(), _EMAIL_CACHE_SIZE)
+        return email
         
-        Supplier Details:
-        Name: {supplier_data.get('name', 'N/A')}
-        Contact: {supplier_data.get('contactEmail', 'N/A')}
-        """
+    except _AI_CALL_ERRORS as e:
+        logger.error(f"Error generating email proposal: {str(e)}")
+        return _get_fallback_email(rfq_data, supplier_data)
+
+async def _generate_emails_for_product(rfq_data: Dict[str, Any], product_data: Dict[str, Any], suppliers: List[Dict[str, Any]]) -> List[EmailTemplate]:
+    """Generate proposal emails for several suppliers of one product with a single model call"""
+    client = get_openai_client()
+    if client is None:
+        return [_get_fallback_email(rfq_data, supplier_data) for supplier_data in suppliers]
+    
+    try:
+        user_content = _MULTI_EMAIL_USER_TEMPLATE.format_map({
+            "rfq": _WithDefault(rfq_data),
+            "product": _WithDefault(product_data),
+            "specs": _compact_specs(product_data.get("specifications")),
+            "suppliers": "\n".join(
+                _MULTI_EMAIL_SUPPLIER_LINE.format_map({"n": n, "supplier": _WithDefault(supplier_data)})
+                for n, supplier_data in enumerate(suppliers, 1)
+            ),
+        })
         
-        response = client.chat.completions.create(
-            model="Qwen/Qwen2.5-32B-Instruct",
+        response = await client.chat.completions.create(
+            model=AI_MODEL,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": _MULTI_EMAIL_SYSTEM_PROMPT},
                 {"role": "user", "content": user_content}
             ],
             temperature=0.3,
-            max_tokens=1500
+            max_tokens=_EMAIL_MAX_TOKENS * len(suppliers),
+            response_format=_MULTI_EMAIL_RESPONSE_FORMAT
         )
         
-        result = json.loads(response.choices[0].message.content)
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error generating email proposal: {str(e)}")
-        return {
-            "subject": f"Proposal for {rfq_data.get('title', 'Your RFQ')}",
-            "body": f"Dear Procurement Team,\n\nWe are pleased to submit our proposal for your recent RFQ.\n\nBest regards,\n{supplier_data.get('name', 'Supplier Team')}"
-        }
+        replies = _MULTI_EMAIL_ADAPTER.validate_json(_strip_json_fence(_reply_text(response)))["emails"]
+        if len(replies) != len(suppliers):
+            raise ValueError(f"expected {len(suppliers)} emails, got {len(replies)}")
+        emails = [
+            EmailTemplate(to=supplier_data.get('contactEmail', ''), subject=reply["subject"], body=reply["body"])
+            for supplier_data, reply in zip(suppliers, replies)
+        ]
+    
+    except _AI_CALL_ERRORS as e:
+        logger.warning(f"Batched email generation failed, retrying suppliers one by one: {str(e)}")
+        return [await generate_email_proposal(rfq_data, product_data, supplier_data) for supplier_data in suppliers]
+    
+    for supplier_data, email in zip(suppliers, emails):
+        _cache_put(_email_cache, _payload_key(rfq_data, product_data, supplier_data), email.model_copy(), _EMAIL_CACHE_SIZE)
+    return emails
+
+async def generate_email_proposals(rfq_data: Dict[str, Any], items: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[EmailTemplate]:
+    """Generate proposal emails for several (product, supplier) pairs, in input order"""
+    results: List[Optional[EmailTemplate]] = [None] * len(items)
+    
+    # Identical pairs are generated once and cached pairs not at all
+    pending: Dict[str, List[int]] = {}
+    for i, (product_data, supplier_data) in enumerate(items):
+        key = _payload_key(rfq_data, product_data, supplier_data)
+        cached = _cache_get(_email_cache, key)
+        if cached is not None:
+            results[i] = cached.model_copy()
+        else:
+            pending.setdefault(key, []).append(i)
+    
+    # Remaining pairs are grouped by product so each product's suppliers can
+    # share a request
+    by_product: Dict[str, List[List[int]]] = {}
+    for indices in pending.values():
+        by_product.setdefault(_payload_key(items[indices[0]][0]), []).append(indices)
+    
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+    
+    async def generate(product_data: Dict[str, Any], supplier_data: Dict[str, Any]) -> EmailTemplate:
+        async with semaphore:
+            return await generate_email_proposal(rfq_data, product_data, supplier_data)
+    
+    async def generate_for_product(pairs: List[List[int]]) -> None:
+        product_data = items[pairs[0][0]][0]
+        suppliers = [items[indices[0]][1] for indices in pairs]
+        if len(suppliers) >= _MIN_SUPPLIERS_PER_MULTI_EMAIL:
+            async with semaphore:
+                emails = await _generate_emails_for_product(rfq_data, product_data, suppliers)
+        else:
+            emails = await asyncio.gather(*(generate(product_data, supplier_data) for supplier_data in suppliers))
+        for indices, email in zip(pairs, emails):
+            for i in indices:
+                results[i] = email.model_copy()
+    
+    await asyncio.gather(*(generate_for_product(pairs) for pairs in by_product.values()))
+    return results
+
+def _get_fallback_email(rfq_data: Dict[str, Any], supplier_data: Dict[str, Any]) -> EmailTemplate:
+    """Return a generic proposal email when AI generation is unavailable"""
+    return EmailTemplate(
+        to=supplier_data.get('contactEmail', ''),
+        subject=_FALLBACK_EMAIL_SUBJECT.substitute(title=rfq_data.get('title', 'Your RFQ')),
+        body=_FALLBACK_EMAIL_BODY.substitute(supplier_name=supplier_data.get('name', 'Supplier Team'))
+    )
@@ -5,14 +5,20 @@ This module provides functionality to check compliance with export regulations
 and other regulatory requirements for AI hardware procurement.
 """
 
+import functools
 import os
 import json
 import logging
 import re
+import time
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Set, Tuple
+from urllib.parse import urlsplit
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +34,35 @@ HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
 }
 
+# Shared session so repeat fetches reuse pooled keep-alive connections.
+# Only failed connects are retried: a read timeout means the site is slow,
+# and retrying it would multiply the read timeout below
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.headers.update(HEADERS)
+_http_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, read=0, backoff_factor=0.3)
+)
+HTTP_SESSION.mount('https://', _http_adapter)
+HTTP_SESSION.mount('http://', _http_adapter)
+
+# Separate (connect, read) timeouts so an unreachable host fails fast
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Separator between a company name and the rest of a page title,
+# e.g. "Acme Corp - Home" or "Acme Corp | Official Website"
+TITLE_SEPARATOR_PATTERN = re.compile(r'[-|]')
+
+# Links on a homepage that are likely to lead to an address
+CONTACT_LINK_PATTERN = re.compile(r'contact|about|location', re.I)
+
+# Most detected website countries remembered per service
+MAX_CACHED_WEBSITE_COUNTRIES = 4096
+
+# Most contact/about links tried per website, fetched in parallel
+MAX_CONTACT_PAGES = 8
+
 # Geopolitical restrictions - major countries and their restrictions
 COUNTRY_RESTRICTIONS = {
     "United States": {
@@ -60,6 +95,18 @@ COUNTRY_RESTRICTIONS = {
     }
 }
 
+def _index_regulators_by_country(list_name: str) -> Dict[str, List[str]]:
+    """Invert one COUNTRY_RESTRICTIONS list into supplier country -> regulators."""
+    index: Dict[str, List[str]] = {}
+    for regulator, restrictions in COUNTRY_RESTRICTIONS.items():
+        for country in restrictions[list_name]:
+            index.setdefault(country, []).append(regulator)
+    return index
+
+# Regulators restricting each supplier country, so a compliance check is a lookup
+RESTRICTING_REGULATORS = _index_regulators_by_country("restricted_countries")
+PARTIALLY_RESTRICTING_REGULATORS = _index_regulators_by_country("partially_restricted")
+
 # Product restriction thresholds
 GPU_RESTRICTION_THRESHOLDS = {
     "memory_capacity": 32,  # GB
@@ -68,13 +115,155 @@ GPU_RESTRICTION_THRESHOLDS = {
     "int8_performance": 400  # TOPS
 }
 
+# Buyer countries under broad export restrictions
+BROAD_EMBARGO_COUNTRIES = frozenset({
+    "Russia", "Belarus", "Iran", "Syria", "North Korea", "Cuba", "Crimea"
+})
+
+# Destinations needing an export license for products with export restrictions
+LICENSE_SENSITIVE_COUNTRIES = frozenset({
+    "China", "Russia", "Iran", "Belarus", "North Korea",
+    "Syria", "Venezuela", "Cuba", "Myanmar", "Afghanistan"
+})
+
+# Destinations high-performance AI hardware cannot be shipped to
+HIGH_PERFORMANCE_BLOCKED_COUNTRIES = frozenset({
+    "China", "Russia", "Iran", "Belarus", "North Korea", "Syria"
+})
+
+# Generic TLDs that say nothing about a company's country
+GENERIC_TLDS = frozenset({'com', 'org', 'net', 'info'})
+
+# Second-level labels under a country TLD, as in example.co.uk or example.com.au
+SECOND_LEVEL_DOMAINS = frozenset({'co', 'com', 'org', 'net', 'ac', 'gov', 'edu', 'ltd', 'plc'})
+
+# Meta tag properties that usually carry the site or company name
+SITE_NAME_META_PROPERTIES = frozenset({'og:site_name', 'og:title'})
+
+# Bit flags for each exceeded GPU_RESTRICTION_THRESHOLDS entry
+EXCEEDS_MEMORY_CAPACITY = 1
+EXCEEDS_MEMORY_BANDWIDTH = 2
+EXCEEDS_FP32_PERFORMANCE = 4
+EXCEEDS_INT8_PERFORMANCE = 8
+EXCEEDS_PERFORMANCE = EXCEEDS_FP32_PERFORMANCE | EXCEEDS_INT8_PERFORMANCE
+
+
+def exceeded_thresholds(product_specs: Dict[str, Any]) -> int:
+    """
+    Check a product's specifications against the export restriction thresholds.
+    
+    Args:
+        product_specs: Product specifications
+        
+    Returns:
+        Bitmask of EXCEEDS_* flags, zero if the product is below every threshold
+    """
+    compute_specs = product_specs.get("computeSpecs", {})
+    memory_specs = product_specs.get("memorySpecs", {})
+    
+    flags = 0
+    if memory_specs.get("capacity", 0) >= GPU_RESTRICTION_THRESHOLDS["memory_capacity"]:
+        flags |= EXCEEDS_MEMORY_CAPACITY
+    if memory_specs.get("bandwidth", 0) >= GPU_RESTRICTION_THRESHOLDS["memory_bandwidth"]:
+        flags |= EXCEEDS_MEMORY_BANDWIDTH
+    if compute_specs.get("fp32Performance", 0) >= GPU_RESTRICTION_THRESHOLDS["fp32_performance"]:
+        flags |= EXCEEDS_FP32_PERFORMANCE
+    if compute_specs.get("int8Performance", 0) >= GPU_RESTRICTION_THRESHOLDS["int8_performance"]:
+        flags |= EXCEEDS_INT8_PERFORMANCE
+    return flags
+
+
+# Warning for each exceeded threshold as (flag, spec section, field, message);
+# the threshold is baked into the message once so a check only fills in the value
+THRESHOLD_WARNINGS = (
+    (EXCEEDS_MEMORY_CAPACITY, "memorySpecs", "capacity",
+     f"Product has {{}}GB memory, which exceeds the {GPU_RESTRICTION_THRESHOLDS['memory_capacity']}GB threshold for unrestricted export"),
+    (EXCEEDS_MEMORY_BANDWIDTH, "memorySpecs", "bandwidth",
+     f"Product has {{}}GB/s memory bandwidth, which exceeds the {GPU_RESTRICTION_THRESHOLDS['memory_bandwidth']}GB/s threshold for unrestricted export"),
+    (EXCEEDS_FP32_PERFORMANCE, "computeSpecs", "fp32Performance",
+     f"Product has {{}}TFLOPS FP32 performance, which exceeds the {GPU_RESTRICTION_THRESHOLDS['fp32_performance']}TFLOPS threshold for unrestricted export"),
+    (EXCEEDS_INT8_PERFORMANCE, "computeSpecs", "int8Performance",
+     f"Product has {{}}TOPS INT8 performance, which exceeds the {GPU_RESTRICTION_THRESHOLDS['int8_performance']}TOPS threshold for unrestricted export"),
+)
+
+
+def threshold_spec_values(product_specs: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    Collect the specification values the export thresholds are checked against.
+    
+    Args:
+        product_specs: Product specifications
+        
+    Returns:
+        Tuple of values in THRESHOLD_WARNINGS order, 0 where a value is missing
+    """
+    return tuple(
+        product_specs.get(section, {}).get(field, 0)
+        for _, section, field, _ in THRESHOLD_WARNINGS
+    )
+
+
+def website_hostname(website_url: str) -> str:
+    """
+    Get the lowercased host name of a website URL, with or without a scheme.
+    
+    Args:
+        website_url: URL of the website, e.g. "https://www.example.com/about" or "example.com"
+        
+    Returns:
+        Host name without port or credentials, empty if there is none
+    """
+    if '//' not in website_url:
+        website_url = '//' + website_url
+    return urlsplit(website_url).hostname or ''
+
+
+# Last report timestamp as (whole second, ISO string), replaced as one tuple so
+# concurrent readers never see a mismatched pair
+_report_timestamp = (0, "")
+
+
+def _report_timestamp_now() -> str:
+    """Current local time in ISO format at one-second resolution, formatted once per second."""
+    global _report_timestamp
+    second = int(time.time())
+    cached_second, iso = _report_timestamp
+    if second != cached_second:
+        iso = datetime.fromtimestamp(second).isoformat()
+        _report_timestamp = (second, iso)
+    return iso
+
+
 class ComplianceService:
     """Service for checking compliance with export regulations."""
     
     def __init__(self):
         """Initialize the compliance service."""
         self.country_domain_map = self._load_country_domain_map()
+        self.country_names = {name.casefold(): name for name in self.country_domain_map.values()}
+        self.country_name_pattern = re.compile(
+            r'\b(' + '|'.join(map(re.escape, self.country_names)) + r')\b', re.I
+        )
         self.sanctions_lists = self._load_sanctions_lists()
+        (
+            self.sanctions_pattern,
+            self.sanctioned_entity_jurisdictions,
+            self.sanctioned_entities_text,
+        ) = self._build_sanctions_index()
+        
+        # Detected website countries. Only successful detections are kept, so a
+        # website that timed out or could not be parsed is retried next time
+        self._website_countries: Dict[str, str] = {}
+        # Cache per instance rather than on the class so the cache never outlives
+        # the service; the sanctions data is fixed once loaded, so repeat calls
+        # are plain dictionary hits
+        self._sanctioned_jurisdictions = functools.lru_cache(maxsize=4096)(self._sanctioned_jurisdictions)
+        # Parsed pages are large, so only the recent ones are kept; country and
+        # company name detection for one website then share a single fetch
+        self._fetch_soup = functools.lru_cache(maxsize=32)(self._fetch_soup)
+        # Transactions repeat the same country pairs and products, and the
+        # assessment depends on nothing else
+        self._assess_transaction = functools.lru_cache(maxsize=8192)(self._assess_transaction)
     
     def _load_country_domain_map(self) -> Dict[str, str]:
         """
@@ -127,9 +316,108 @@ class ComplianceService:
             ]
         }
     
+    def _build_sanctions_index(self) -> Tuple[re.Pattern, Dict[str, List[str]], Dict[str, str]]:
+        """
+        Index the sanctions lists so a company name can be checked in a single pass.
+        
+        Returns:
+            Tuple of (pattern matching any sanctioned entity, mapping of casefolded
+            entity to its jurisdictions, newline-joined casefolded entities per jurisdiction)
+        """
+        entity_jurisdictions: Dict[str, List[str]] = {}
+        for jurisdiction, entities in self.sanctions_lists.items():
+            for entity in entities:
+                entity_jurisdictions.setdefault(entity.casefold(), []).append(jurisdiction)
+        
+        # Only the longest entity starting at a position is matched there, so an
+        # entity also reports the jurisdictions of any shorter entity it starts with
+        for entity, jurisdictions in entity_jurisdictions.items():
+            for other, other_jurisdictions in entity_jurisdictions.items():
+                if other != entity and entity.startswith(other):
+                    jurisdictions.extend(j for j in other_jurisdictions if j not in jurisdictions)
+        
+        # Longest names first so an entity wins over any shorter entity it starts
+        # with; the lookahead lets matches overlap so entities starting elsewhere
+        # in the name are found too
+        alternatives = sorted(entity_jurisdictions, key=len, reverse=True)
+        pattern = re.compile('(?=(' + '|'.join(map(re.escape, alternatives)) + '))', re.I)
+        
+        joined_entities = {
+            jurisdiction: '\n'.join(entity.casefold() for entity in entities)
+            for jurisdiction, entities in self.sanctions_lists.items()
+        }
+        return pattern, entity_jurisdictions, joined_entities
+    
+    def _find_country_name(self, text: str) -> Optional[str]:
+        """
+        Find the first known country named in a piece of text.
+        
+        Args:
+            text: Text to search
+            
+        Returns:
+            Country name if found, None otherwise
+        """
+        match = self.country_name_pattern.search(text)
+        return self.country_names.get(match.group(1).casefold()) if match else None
+    
+    def _find_country_in_tag(self, tag: Tag) -> Optional[str]:
+        """
+        Find the first known country named in the text of a page element.
+        
+        Searches the element's text strings one at a time and stops at the
+        first match, instead of flattening the whole subtree with get_text().
+        
+        Args:
+            tag: Parsed page or element to search
+            
+        Returns:
+            Country name if found, None otherwise
+        """
+        for text in tag.strings:
+            country_name = self._find_country_name(text)
+            if country_name:
+                return country_name
+        return None
+    
+    def _fetch_soup(self, url: str) -> BeautifulSoup:
+        """
+        Fetch and parse a web page. Failed fetches raise and are not cached.
+        
+        Args:
+            url: URL of the page
+            
+        Returns:
+            Parsed page, shared between callers and not to be modified
+        """
+        response = HTTP_SESSION.get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return BeautifulSoup(response.text, 'html.parser')
+    
     def detect_country_from_website(self, website_url: str) -> Optional[str]:
         """
         Detect the country of a company based on its website domain.
+        Detected countries are cached; failed detections are not.
+        
+        Args:
+            website_url: URL of the company website
+            
+        Returns:
+            Country name if detected, None otherwise
+        """
+        country = self._website_countries.get(website_url)
+        if country is None:
+            country = self._detect_country_from_website(website_url)
+            if country is not None:
+                if len(self._website_countries) >= MAX_CACHED_WEBSITE_COUNTRIES:
+                    # Drop the oldest entry
+                    self._website_countries.pop(next(iter(self._website_countries)), None)
+                self._website_countries[website_url] = country
+        return country
+    
+    def _detect_country_from_website(self, website_url: str) -> Optional[str]:
+        """
+        Detect the country of a company based on its website domain, uncached.
         
         Args:
             website_url: URL of the company website
@@ -139,7 +427,7 @@ class ComplianceService:
         """
         try:
             # Extract domain and TLD
-            domain_parts = website_url.lower().split('/')[-1].split('.')
+            domain_parts = website_hostname(website_url).split('.')
             if len(domain_parts) >= 2:
                 tld = domain_parts[-1]
                 
@@ -148,7 +436,7 @@ class ComplianceService:
                     return self.country_domain_map[tld]
                 
                 # For .com, .org, etc., try to extract country information from the website content
-                if tld in ['com', 'org', 'net', 'info']:
+                if tld in GENERIC_TLDS:
                     return self._extract_country_from_content(website_url)
             
             return None
@@ -167,56 +455,73 @@ class ComplianceService:
             Country name if found, None otherwise
         """
         try:
-            response = requests.get(website_url, headers=HEADERS, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self._fetch_soup(website_url)
             
             # Look for country mentions in common locations
             # 1. Check meta tags
-            meta_tags = soup.find_all('meta')
-            for tag in meta_tags:
-                content = tag.get('content', '').lower()
-                for country_code, country_name in self.country_domain_map.items():
-                    if country_name.lower() in content:
-                        return country_name
+            meta_text = ' '.join(tag['content'] for tag in soup.find_all('meta', content=True))
+            country_name = self._find_country_name(meta_text)
+            if country_name:
+                return country_name
             
             # 2. Check footer text (common location for addresses)
             footer = soup.find('footer')
             if footer:
-                footer_text = footer.get_text().lower()
-                for country_code, country_name in self.country_domain_map.items():
-                    if country_name.lower() in footer_text:
-                        return country_name
+                country_name = self._find_country_in_tag(footer)
+                if country_name:
+                    return country_name
             
             # 3. Check contact/about page links
-            contact_links = soup.find_all('a', href=re.compile(r'contact|about|location', re.I))
-            for link in contact_links:
+            contact_urls = []
+            for link in soup.find_all('a', href=CONTACT_LINK_PATTERN):
                 href = link.get('href', '')
                 if href and not href.startswith(('http', 'www')):
                     # Construct absolute URL
                     if not href.startswith('/'):
                         href = '/' + href
                     contact_url = website_url.rstrip('/') + href
-                    
-                    # Try to extract country from contact page
-                    try:
-                        contact_response = requests.get(contact_url, headers=HEADERS, timeout=10)
-                        contact_soup = BeautifulSoup(contact_response.text, 'html.parser')
-                        contact_text = contact_soup.get_text().lower()
-                        
-                        for country_code, country_name in self.country_domain_map.items():
-                            if country_name.lower() in contact_text:
-                                return country_name
-                    except:
-                        # Skip if contact page access fails
-                        pass
+                    if contact_url not in contact_urls:
+                        contact_urls.append(contact_url)
+                        if len(contact_urls) == MAX_CONTACT_PAGES:
+                            break
+            
+            if contact_urls:
+                # Fetch the pages concurrently, but read the results in page
+                # order so the first link naming a country wins, whichever
+                # page happens to respond first
+                executor = ThreadPoolExecutor(max_workers=len(contact_urls))
+                try:
+                    futures = [executor.submit(self._extract_country_from_contact_page, url) for url in contact_urls]
+                    for future in futures:
+                        country_name = future.result()
+                        if country_name:
+                            return country_name
+                finally:
+                    executor.shutdown(wait=False, cancel_futures=True)
             
             return None
         except Exception as e:
             logger.error(f"Error extracting country from website content {website_url}: {str(e)}")
             return None
     
+    def _extract_country_from_contact_page(self, contact_url: str) -> Optional[str]:
+        """
+        Extract country information from a contact or about page.
+        
+        Args:
+            contact_url: URL of the contact page
+            
+        Returns:
+            Country name if found, None otherwise
+        """
+        try:
+            contact_soup = self._fetch_soup(contact_url)
+        except requests.RequestException:
+            # Skip if contact page access fails
+            return None
+        
+        return self._find_country_in_tag(contact_soup)
+    
     def check_sanctions_list(self, company_name: str) -> List[str]:
         """
         Check if a company is on any sanctions list.
@@ -227,16 +532,40 @@ class ComplianceService:
         Returns:
             List of jurisdictions where the company is sanctioned
         """
-        sanctioned_by = []
-        company_name_lower = company_name.lower()
+        # Copy out of the cached tuple so callers can't alter later results
+        return list(self._sanctioned_jurisdictions(company_name))
+    
+    def _sanctioned_jurisdictions(self, company_name: str) -> Tuple[str, ...]:
+        """
+        Find the jurisdictions whose sanctions lists match a company name.
+        
+        Args:
+            company_name: Name of the company to check
+            
+        Returns:
+            Tuple of matching jurisdictions, in sanctions list order
+        """
+        # casefold rather than lower so names match across case conventions
+        # beyond ASCII (e.g. German sharp s); entities were folded once at load
+        company_name_folded = company_name.casefold()
+        
+        # Sanctioned entities named inside the company name, found in one scan
+        matched = {
+            jurisdiction
+            for match in self.sanctions_pattern.finditer(company_name)
+            for jurisdiction in self.sanctioned_entity_jurisdictions.get(match.group(1).casefold(), ())
+        }
         
-        for jurisdiction, sanctioned_entities in self.sanctions_lists.items():
-            for entity in sanctioned_entities:
-                if entity.lower() in company_name_lower or company_name_lower in entity.lower():
-                    sanctioned_by.append(jurisdiction)
-                    break
+        # A shortened company name contained in an entity name; entities are
+        # newline-separated so a match can never span two of them
+        if '\n' not in company_name_folded:
+            matched.update(
+                jurisdiction
+                for jurisdiction, entities_text in self.sanctioned_entities_text.items()
+                if company_name_folded in entities_text
+            )
         
-        return sanctioned_by
+        return tuple(jurisdiction for jurisdiction in self.sanctions_lists if jurisdiction in matched)
     
     def check_export_compliance(
         self, 
@@ -263,47 +592,26 @@ class ComplianceService:
         }
         
         # Check country-level restrictions
-        for regulator, restrictions in COUNTRY_RESTRICTIONS.items():
-            # Check if supplier is from a restricted country for the buyer
-            if supplier_country in restrictions["restricted_countries"]:
-                result["is_compliant"] = False
-                result["restrictions"].append(
-                    f"Supplier from {supplier_country} is restricted for buyers in {buyer_country} under {regulator} regulations"
-                )
-            
-            # Check if supplier is from a partially restricted country
-            if supplier_country in restrictions["partially_restricted"]:
-                result["warnings"].append(
-                    f"Supplier from {supplier_country} is partially restricted for buyers in {buyer_country} under {regulator} regulations. Additional licensing may be required."
-                )
-        
-        # Check product-specific restrictions
-        compute_specs = product_specs.get("computeSpecs", {})
-        memory_specs = product_specs.get("memorySpecs", {})
-        
-        # Check memory capacity restrictions
-        if memory_specs.get("capacity", 0) >= GPU_RESTRICTION_THRESHOLDS["memory_capacity"]:
-            result["warnings"].append(
-                f"Product has {memory_specs.get('capacity')}GB memory, which exceeds the {GPU_RESTRICTION_THRESHOLDS['memory_capacity']}GB threshold for unrestricted export"
-            )
-        
-        # Check memory bandwidth restrictions
-        if memory_specs.get("bandwidth", 0) >= GPU_RESTRICTION_THRESHOLDS["memory_bandwidth"]:
-            result["warnings"].append(
-                f"Product has {memory_specs.get('bandwidth')}GB/s memory bandwidth, which exceeds the {GPU_RESTRICTION_THRESHOLDS['memory_bandwidth']}GB/s threshold for unrestricted export"
+        # Check if supplier is from a restricted country for the buyer
+        for regulator in RESTRICTING_REGULATORS.get(supplier_country, ()):
+            result["is_compliant"] = False
+            result["restrictions"].append(
+                f"Supplier from {supplier_country} is restricted for buyers in {buyer_country} under {regulator} regulations"
             )
         
-        # Check computational performance restrictions
-        if compute_specs.get("fp32Performance", 0) >= GPU_RESTRICTION_THRESHOLDS["fp32_performance"]:
+        # Check if supplier is from a partially restricted country
+        for regulator in PARTIALLY_RESTRICTING_REGULATORS.get(supplier_country, ()):
             result["warnings"].append(
-                f"Product has {compute_specs.get('fp32Performance')}TFLOPS FP32 performance, which exceeds the {GPU_RESTRICTION_THRESHOLDS['fp32_performance']}TFLOPS threshold for unrestricted export"
+                f"Supplier from {supplier_country} is partially restricted for buyers in {buyer_country} under {regulator} regulations. Additional licensing may be required."
             )
         
-        # Check INT8 performance restrictions
-        if compute_specs.get("int8Performance", 0) >= GPU_RESTRICTION_THRESHOLDS["int8_performance"]:
-            result["warnings"].append(
-                f"Product has {compute_specs.get('int8Performance')}TOPS INT8 performance, which exceeds the {GPU_RESTRICTION_THRESHOLDS['int8_performance']}TOPS threshold for unrestricted export"
-            )
+        # Check product-specific restrictions
+        exceeded = exceeded_thresholds(product_specs)
+        if exceeded:
+            add_warning = result["warnings"].append
+            for flag, section, field, message in THRESHOLD_WARNINGS:
+                if exceeded & flag:
+                    add_warning(message.format(product_specs[section][field]))
         
         # Suggest alternative sources if there are compliance issues
         if not result["is_compliant"] or result["warnings"]:
@@ -314,7 +622,7 @@ class ComplianceService:
                 result["alternative_sources"].append("US-based vendors like NVIDIA, AMD, or Intel")
             
             # If high-performance GPUs are restricted, suggest alternatives
-            if any("performance" in warning for warning in result["warnings"]):
+            if exceeded & EXCEEDS_PERFORMANCE:
                 result["alternative_sources"].append("Consider cloud-based AI services instead of hardware purchase")
                 result["alternative_sources"].append("Split workload across multiple lower-spec devices")
         
@@ -350,15 +658,16 @@ class ComplianceService:
         sanctions = self.check_sanctions_list(supplier.get("name", ""))
         
         # Check export compliance
-        compliance_info = self.check_export_compliance(
+        compliance_info, high_performance, risk_level, required_actions = self._assess_transaction(
             buyer_country,
             supplier_country,
-            product
+            threshold_spec_values(product),
+            tuple(sanctions)
         )
         
-        # Build the report
+        # Build the report, copying the cached assessment so it stays untouched
         report = {
-            "transaction_date": datetime.now().isoformat(),
+            "transaction_date": _report_timestamp_now(),
             "buyer": {
                 "name": buyer.get("company", "Unknown"),
                 "country": buyer_country
@@ -372,15 +681,51 @@ class ComplianceService:
                 "name": product.get("name", "Unknown"),
                 "category": product.get("category", "Unknown"),
                 "type": product.get("type", "Unknown"),
-                "high_performance": self._is_high_performance_product(product)
+                "high_performance": high_performance
+            },
+            "compliance_result": {
+                key: list(value) if isinstance(value, list) else value
+                for key, value in compliance_info.items()
             },
-            "compliance_result": compliance_info,
-            "overall_risk_level": self._calculate_risk_level(compliance_info, sanctions),
-            "required_actions": self._determine_required_actions(compliance_info, sanctions)
+            "overall_risk_level": risk_level,
+            "required_actions": list(required_actions)
         }
         
         return report
     
+    def _assess_transaction(
+        self,
+        buyer_country: str,
+        supplier_country: str,
+        spec_values: Tuple[Any, ...],
+        sanctions: Tuple[str, ...]
+    ) -> Tuple[Dict[str, Any], bool, str, Tuple[str, ...]]:
+        """
+        Assess the compliance of a transaction from its hashable inputs.
+        
+        Args:
+            buyer_country: Country of the buyer
+            supplier_country: Country of the supplier
+            spec_values: Threshold-relevant product values from threshold_spec_values
+            sanctions: Jurisdictions where the supplier is sanctioned
+            
+        Returns:
+            Tuple of (compliance information, whether the product is high-performance,
+            risk level, required actions); shared between calls and not to be modified
+        """
+        product_specs: Dict[str, Dict[str, Any]] = {}
+        for (_, section, field, _), value in zip(THRESHOLD_WARNINGS, spec_values):
+            product_specs.setdefault(section, {})[field] = value
+        
+        sanctions = list(sanctions)
+        compliance_info = self.check_export_compliance(buyer_country, supplier_country, product_specs)
+        return (
+            compliance_info,
+            self._is_high_performance_product(product_specs),
+            self._calculate_risk_level(compliance_info, sanctions),
+            tuple(self._determine_required_actions(compliance_info, sanctions))
+        )
+    
     def _is_high_performance_product(self, product: Dict[str, Any]) -> bool:
         """
         Determine if a product is considered high-performance under export regulations.
@@ -391,17 +736,7 @@ class ComplianceService:
         Returns:
             Boolean indicating if the product is high-performance
         """
-        compute_specs = product.get("computeSpecs", {})
-        memory_specs = product.get("memorySpecs", {})
-        
-        # Check against thresholds
-        if (memory_specs.get("capacity", 0) >= GPU_RESTRICTION_THRESHOLDS["memory_capacity"] or
-            memory_specs.get("bandwidth", 0) >= GPU_RESTRICTION_THRESHOLDS["memory_bandwidth"] or
-            compute_specs.get("fp32Performance", 0) >= GPU_RESTRICTION_THRESHOLDS["fp32_performance"] or
-            compute_specs.get("int8Performance", 0) >= GPU_RESTRICTION_THRESHOLDS["int8_performance"]):
-            return True
-        
-        return False
+        return bool(exceeded_thresholds(product))
     
     def _calculate_risk_level(self, compliance_info: Dict[str, Any], sanctions: List[str]) -> str:
         """
@@ -495,7 +830,7 @@ class ComplianceService:
                 result["notes"].append(f"Company appears on {', '.join(sanctions)} sanctions lists")
         
         # Check if the country is under broad restrictions
-        if result["country"] in ["Russia", "Belarus", "Iran", "Syria", "North Korea", "Cuba", "Crimea"]:
+        if result["country"] in BROAD_EMBARGO_COUNTRIES:
             result["is_compliant"] = False
             result["risk_level"] = "Critical"
             result["notes"].append(f"Buyer country ({result['country']}) is under broad export restrictions")
@@ -522,10 +857,7 @@ class ComplianceService:
             Company name if found, None otherwise
         """
         try:
-            response = requests.get(website_url, headers=HEADERS, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self._fetch_soup(website_url)
             
             # Try different approaches to extract company name
             
@@ -533,7 +865,7 @@ class ComplianceService:
             title = soup.title.string if soup.title else None
             if title:
                 # Remove common title suffixes like "- Home", "| Official Website"
-                cleaned_title = re.sub(r'\s*[-|]\s*.*$', '', title.strip())
+                cleaned_title = TITLE_SEPARATOR_PATTERN.split(title.strip(), maxsplit=1)[0].rstrip()
                 if cleaned_title:
                     return cleaned_title
             
@@ -543,21 +875,19 @@ class ComplianceService:
                 return logo.get('alt')
             
             # 3. Look for company name in meta tags
-            meta_tags = soup.find_all('meta')
-            for tag in meta_tags:
-                if tag.get('property') in ['og:site_name', 'og:title']:
-                    return tag.get('content')
+            site_name_tag = soup.find('meta', property=lambda value: value in SITE_NAME_META_PROPERTIES)
+            if site_name_tag:
+                return site_name_tag.get('content')
             
             # 4. Extract from domain name
-            domain = website_url.lower().split('//')[-1].split('/')[0]
-            domain_parts = domain.split('.')
+            domain_parts = website_hostname(website_url).split('.')
             if len(domain_parts) >= 2:
-                # Remove common TLDs and www
-                if domain_parts[0] == 'www':
-                    domain_parts.pop(0)
-                if domain_parts[-1] in ['com', 'org', 'net', 'io', 'co']:
+                # Drop the TLD, and a second-level suffix like the "co" in .co.uk,
+                # so the registered name is left rather than "www" or a subdomain
+                tld = domain_parts.pop()
+                if len(tld) == 2 and len(domain_parts) >= 2 and domain_parts[-1] in SECOND_LEVEL_DOMAINS:
                     domain_parts.pop()
-                return domain_parts[0].capitalize()
+                return domain_parts[-1].capitalize()
             
             return None
         except Exception as e:
@@ -596,12 +926,7 @@ def check_product_shipping_restrictions(product_specs: Dict[str, Any], destinati
     export_restrictions = compliance_info.get("exportRestrictions", [])
     if export_restrictions:
         # If there are export restrictions and destination is a sensitive country
-        sensitive_countries = [
-            "China", "Russia", "Iran", "Belarus", "North Korea", 
-            "Syria", "Venezuela", "Cuba", "Myanmar", "Afghanistan"
-        ]
-        
-        if destination_country in sensitive_countries:
+        if destination_country in LICENSE_SENSITIVE_COUNTRIES:
             result["requires_license"] = True
             result["required_documents"].append("Export license from origin country")
             result["required_documents"].append("End-user certificate")
@@ -613,24 +938,14 @@ def check_product_shipping_restrictions(product_specs: Dict[str, Any], destinati
                 )
     
     # Check if product is high-performance
-    is_high_performance = False
-    compute_specs = product_specs.get("computeSpecs", {})
-    memory_specs = product_specs.get("memorySpecs", {})
-    
-    if (memory_specs.get("capacity", 0) >= GPU_RESTRICTION_THRESHOLDS["memory_capacity"] or
-        memory_specs.get("bandwidth", 0) >= GPU_RESTRICTION_THRESHOLDS["memory_bandwidth"] or
-        compute_specs.get("fp32Performance", 0) >= GPU_RESTRICTION_THRESHOLDS["fp32_performance"] or
-        compute_specs.get("int8Performance", 0) >= GPU_RESTRICTION_THRESHOLDS["int8_performance"]):
-        is_high_performance = True
-    
-    if is_high_performance:
+    if exceeded_thresholds(product_specs):
         # High-performance products have additional restrictions
         if not result["requires_license"]:
             result["requires_license"] = True
             result["required_documents"].append("Export license from origin country")
             result["required_documents"].append("End-user certificate")
         
-        if destination_country in ["China", "Russia", "Iran", "Belarus", "North Korea", "Syria"]:
+        if destination_country in HIGH_PERFORMANCE_BLOCKED_COUNTRIES:
             result["can_ship"] = False
             result["restrictions"].append(
                 f"High-performance AI hardware cannot be shipped to {destination_country} under current regulations"
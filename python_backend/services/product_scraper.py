@@ -5,14 +5,23 @@ This module provides functionality to scrape product information from
 various manufacturer and supplier websites, focusing on GPUs and AI accelerators.
 """
 
+import abc
+import asyncio
+import functools
+import hashlib
+import itertools
 import os
 import json
 import logging
 import re
 import requests
-from bs4 import BeautifulSoup
+import soupsieve
+import textwrap
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 
 # Configure logging
 logging.basicConfig(
@@ -34,34 +43,369 @@ HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
 }
 
-class ProductScraper:
+# Text cleanup and spec parsing patterns
+WHITESPACE_PATTERN = re.compile(r'\s+')
+SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s.,-]')
+# The ASCII characters SPECIAL_CHARS_PATTERN matches, for bytes.translate
+ASCII_SPECIAL_CHARS = bytes(c for c in range(128) if SPECIAL_CHARS_PATTERN.match(chr(c)))
+NUMBER_PATTERN = re.compile(r'(\d+\.?\d*)')
+NVIDIA_MODEL_PATTERN = re.compile(r'NVIDIA\s+([A-Z0-9-]+)')
+
+# Where a spec table row goes, checked in order: (words the lowercased key must
+# all contain, product section or None for a top-level field, field, value kind).
+# "number" stores the parsed number, "positive" only a non-zero one, "text" the
+# raw value and "flag" whether the value says yes
+NVIDIA_SPEC_FIELDS = (
+    (('architecture',), None, 'architecture', 'text'),
+    (('cuda cores',), 'computeSpecs', 'cudaCores', 'number'),
+    (('tensor cores',), 'computeSpecs', 'tensorCores', 'number'),
+    (('fp32', 'performance'), 'computeSpecs', 'fp32Performance', 'number'),
+    (('fp16', 'performance'), 'computeSpecs', 'fp16Performance', 'number'),
+    (('int8', 'performance'), 'computeSpecs', 'int8Performance', 'number'),
+    (('clock',), 'computeSpecs', 'clockSpeed', 'number'),
+    (('memory', 'size'), 'memorySpecs', 'capacity', 'positive'),
+    (('memory', 'bandwidth'), 'memorySpecs', 'bandwidth', 'positive'),
+    (('memory', 'type'), 'memorySpecs', 'type', 'text'),
+    (('memory', 'bus'), 'memorySpecs', 'busWidth', 'positive'),
+    (('ecc',), 'memorySpecs', 'eccSupport', 'flag'),
+    (('tdp',), 'powerConsumption', 'tdp', 'positive'),
+    (('power',), 'powerConsumption', 'tdp', 'positive'),
+)
+
+# Every word NVIDIA_SPEC_FIELDS looks for, so a key is scanned once for all of
+# them. Longest first, in a lookahead so matches can overlap; no two words may
+# start with the same text or the shorter one would be missed
+NVIDIA_SPEC_WORD_PATTERN = re.compile(
+    '(?=(' + '|'.join(sorted(
+        {re.escape(word) for words, _, _, _ in NVIDIA_SPEC_FIELDS for word in words},
+        key=len, reverse=True
+    )) + '))',
+    re.I
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def nvidia_spec_field(key: str) -> Optional[Tuple[Optional[str], str, str]]:
+    """
+    Find where an NVIDIA spec table row belongs. Cached, as the same spec names
+    repeat across product pages.
+    
+    Args:
+        key: Cleaned spec name, e.g. "Peak FP32 Performance"
+        
+    Returns:
+        Tuple of (product section or None, field, value kind), or None if the row
+        has no structured field
+    """
+    found = {match.group(1).lower() for match in NVIDIA_SPEC_WORD_PATTERN.finditer(key)}
+    for words, section, field, kind in NVIDIA_SPEC_FIELDS:
+        if found.issuperset(words):
+            return section, field, kind
+    return None
+
+
+# Spec labels and values are short and repeat across pages; longer text such
+# as descriptions is unique per page and not worth caching
+MAX_CACHED_TEXT_LENGTH = 128
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_text(text: str) -> str:
+    """
+    Collapse whitespace and drop special characters. Cached for short strings
+    through ProductScraper.clean_text.
+    
+    Args:
+        text: The text to normalize
+        
+    Returns:
+        Normalized text
+    """
+    if text.isascii():
+        # Same result as the regexes below, without the regex engine
+        text = ' '.join(text.split()).encode('ascii').translate(None, ASCII_SPECIAL_CHARS)
+        return text.decode('ascii').strip()
+    
+    # Remove extra whitespace
+    text = WHITESPACE_PATTERN.sub(' ', text.strip())
+    # Remove special characters
+    text = SPECIAL_CHARS_PATTERN.sub('', text)
+    return text.strip()
+
+# CSS selectors, compiled once rather than re-parsed on every page
+NVIDIA_PRODUCT_LINK_SELECTOR = soupsieve.compile('a[href*="/data-center/products/"]')
+AMD_PRODUCT_LINK_SELECTOR = soupsieve.compile('a[href*="/products/graphics/"]')
+DESCRIPTION_SELECTOR = soupsieve.compile('meta[name="description"]')
+FRAMEWORKS_SECTION_SELECTOR = soupsieve.compile('section:-soup-contains("frameworks")')
+
+# Listing pages are only scanned for product links, so only anchors are parsed
+LINK_STRAINER = SoupStrainer('a', href=True)
+
+# Flat columns for tabular analysis of products, as
+# (column, product section or None for a top-level field, field, pandas dtype)
+PRODUCT_COLUMNS = (
+    ("name", None, "name", "string"),
+    ("manufacturer", None, "manufacturer", "string"),
+    ("model", None, "model", "string"),
+    ("architecture", None, "architecture", "string"),
+    ("price", None, "price", "Float64"),
+    ("cudaCores", "computeSpecs", "cudaCores", "Float32"),
+    ("tensorCores", "computeSpecs", "tensorCores", "Float32"),
+    ("fp32Performance", "computeSpecs", "fp32Performance", "Float32"),
+    ("fp16Performance", "computeSpecs", "fp16Performance", "Float32"),
+    ("int8Performance", "computeSpecs", "int8Performance", "Float32"),
+    ("memoryCapacity", "memorySpecs", "capacity", "Float32"),
+    ("memoryBandwidth", "memorySpecs", "bandwidth", "Float32"),
+    ("memoryType", "memorySpecs", "type", "string"),
+    ("tdp", "powerConsumption", "tdp", "Float32"),
+    ("inStock", None, "inStock", "boolean"),
+    ("dataSourceUrl", None, "dataSourceUrl", "string"),
+)
+
+# Prefer the C-based lxml parser when it is installed; html.parser is pure Python
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Largest page body read; marketing pages carry large script and tracking
+# payloads after the content the scrapers use
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+# Where scraped products are saved
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
+
+# Pages kept with their ETag/Last-Modified so repeat scrapes can revalidate
+# them with a conditional GET instead of downloading them again
+PAGE_CACHE_DIR = os.path.join(DATA_DIR, 'page_cache')
+
+# Most product pages fetched at once, to stay polite to manufacturer sites
+MAX_CONCURRENT_FETCHES = 16
+
+def save_json(filename: str, data: Dict[str, Any]) -> str:
+    """
+    Save data as indented JSON in the data directory.
+    
+    Args:
+        filename: The name of the file to save to
+        data: The data to save
+        
+    Returns:
+        Path of the saved file
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    filepath = os.path.join(DATA_DIR, filename)
+    
+    # Encode in one go and write once; json.dump would issue a write per token
+    content = json.dumps(data, indent=2)
+    with open(filepath, 'w') as f:
+        f.write(content)
+    return filepath
+
+
+def save_json_products(filename: str, products: Iterable[Dict[str, Any]], metadata: Dict[str, Any]) -> str:
+    """
+    Save products as indented JSON in the data directory, one product at a time.
+    
+    The file matches save_json(filename, {'products': [...], **metadata}), but
+    only one product is encoded in memory at once and products may come from
+    a generator.
+    
+    Args:
+        filename: The name of the file to save to
+        products: The products to save
+        metadata: Further top-level fields written after the products
+        
+    Returns:
+        Path of the saved file
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    filepath = os.path.join(DATA_DIR, filename)
+    
+    with open(filepath, 'w') as f:
+        f.write('{\n  "products": [')
+        separator = '\n'
+        for product in products:
+            # Nest each product two levels deep, as json.dumps would
+            f.write(separator + textwrap.indent(json.dumps(product, indent=2), '    '))
+            separator = ',\n'
+        if separator != '\n':
+            f.write('\n  ')
+        f.write(']')
+        for key, value in metadata.items():
+            f.write(f',\n  {json.dumps(key)}: ' + json.dumps(value, indent=2).replace('\n', '\n  '))
+        f.write('\n}')
+    return filepath
+
+
+class ProductScraper(abc.ABC):
     """Base class for product scrapers."""
     
     def __init__(self):
         """Initialize the scraper."""
         self.products = []
         self.errors = []
+        # Set once per scrape run and shared by all products of the run
+        self.scraped_at = None
+        
+        # One keep-alive session per scraper so pages on the same host reuse
+        # connections, with a pool big enough for every concurrent fetch
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENT_FETCHES)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
     
-    def get_page(self, url: str) -> Optional[BeautifulSoup]:
+    def get_page(self, url: str, parse_only: Optional[SoupStrainer] = None) -> Optional[BeautifulSoup]:
         """
         Fetch a web page and return its BeautifulSoup object.
         
         Args:
             url: The URL to fetch
+            parse_only: Optional strainer limiting which elements are parsed
             
         Returns:
             BeautifulSoup object if successful, None otherwise
         """
         try:
-            response = requests.get(url, headers=HEADERS, timeout=10)
-            response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
+            cached = self._load_cached_page(url)
+            conditional_headers = {}
+            if cached:
+                if cached.get("etag"):
+                    conditional_headers["If-None-Match"] = cached["etag"]
+                if cached.get("lastModified"):
+                    conditional_headers["If-Modified-Since"] = cached["lastModified"]
+            
+            with self.session.get(url, headers=conditional_headers, timeout=10, stream=True) as response:
+                if cached and response.status_code == 304:
+                    logger.info(f"Using cached copy of unchanged page {url}")
+                    return BeautifulSoup(
+                        cached["body"], HTML_PARSER, from_encoding=cached.get("encoding"), parse_only=parse_only
+                    )
+                
+                response.raise_for_status()
+                
+                # Stop downloading once the cap is reached; the parser copes
+                # with the unclosed tags left at the cut
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=65536):
+                    body += chunk
+                    if len(body) >= MAX_PAGE_BYTES:
+                        logger.warning(f"Truncated {url} at {MAX_PAGE_BYTES} bytes")
+                        break
+                body = bytes(body)
+                
+                # Use the server's charset if it sent one, otherwise let the
+                # parser detect it from the page (e.g. a meta charset tag)
+                content_type = response.headers.get('Content-Type', '').lower()
+                encoding = response.encoding if 'charset=' in content_type else None
+                self._store_cached_page(url, response, body, encoding)
+                return BeautifulSoup(body, HTML_PARSER, from_encoding=encoding, parse_only=parse_only)
         except requests.RequestException as e:
             logger.error(f"Error fetching {url}: {str(e)}")
             self.errors.append(f"Failed to fetch {url}: {str(e)}")
             return None
     
-    def clean_text(self, text: str) -> str:
+    def _cached_page_path(self, url: str) -> str:
+        """
+        Get the cache file path for a page, without extension.
+        
+        Args:
+            url: The URL of the page
+            
+        Returns:
+            Path shared by the page's metadata (.json) and body (.html) files
+        """
+        return os.path.join(PAGE_CACHE_DIR, hashlib.sha256(url.encode()).hexdigest())
+    
+    def _load_cached_page(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a previously fetched page and its validators from the page cache.
+        
+        Args:
+            url: The URL of the page
+            
+        Returns:
+            Dictionary with etag, lastModified, encoding and body, or None if not cached
+        """
+        path = self._cached_page_path(url)
+        try:
+            with open(path + '.json') as f:
+                cached = json.load(f)
+            if not isinstance(cached, dict):
+                return None
+            with open(path + '.html', 'rb') as f:
+                cached["body"] = f.read()
+            return cached
+        except (OSError, ValueError):
+            return None
+    
+    def _store_cached_page(self, url: str, response: requests.Response, body: bytes, encoding: Optional[str]) -> None:
+        """
+        Store a fetched page in the page cache if the server sent validators for it.
+        
+        Args:
+            url: The URL of the page
+            response: The response the page was read from
+            body: The page body as read
+            encoding: The declared character encoding, if any
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        
+        path = self._cached_page_path(url)
+        try:
+            os.makedirs(PAGE_CACHE_DIR, exist_ok=True)
+            # Write the body before its metadata so a metadata file always has a body
+            with open(path + '.html.tmp', 'wb') as f:
+                f.write(body)
+            os.replace(path + '.html.tmp', path + '.html')
+            with open(path + '.json.tmp', 'w') as f:
+                json.dump({"etag": etag, "lastModified": last_modified, "encoding": encoding}, f)
+            os.replace(path + '.json.tmp', path + '.json')
+        except OSError as e:
+            logger.warning(f"Could not cache page {url}: {str(e)}")
+    
+    @abc.abstractmethod
+    def extract_product_info(self, url: str, scraped_at: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Extract product information from a product page.
+        
+        Args:
+            url: The URL of the product page
+            scraped_at: ISO timestamp of the scrape run, defaults to now
+            
+        Returns:
+            Dictionary containing product information
+        """
+    
+    def extract_products(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """
+        Extract product information from several product pages concurrently.
+        
+        Args:
+            urls: The URLs of the product pages
+            
+        Returns:
+            List of product dictionaries in URL order, skipping pages that failed
+        """
+        if not urls:
+            return []
+        
+        self.scraped_at = datetime.now().isoformat()
+        
+        def scrape(url: str) -> Optional[Dict[str, Any]]:
+            logger.info(f"Scraping product from {url}")
+            return self.extract_product_info(url, self.scraped_at)
+        
+        with ThreadPoolExecutor(max_workers=min(len(urls), MAX_CONCURRENT_FETCHES)) as executor:
+            return [product_info for product_info in executor.map(scrape, urls) if product_info]
+    
+    @staticmethod
+    def clean_text(text: str) -> str:
         """
         Clean and normalize text.
         
@@ -73,14 +417,12 @@ class ProductScraper:
         """
         if not text:
             return ""
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
-        # Remove special characters
-        text = re.sub(r'[^\w\s.,-]', '', text)
-        return text.strip()
+        if len(text) > MAX_CACHED_TEXT_LENGTH:
+            return normalize_text.__wrapped__(text)
+        return normalize_text(text)
     
-    def extract_number(self, text: str) -> Optional[float]:
+    @staticmethod
+    def extract_number(text: str) -> Optional[float]:
         """
         Extract a number from a string.
         
@@ -93,11 +435,36 @@ class ProductScraper:
         if not text:
             return None
             
-        match = re.search(r'(\d+\.?\d*)', text)
+        match = NUMBER_PATTERN.search(text)
         if match:
             return float(match.group(1))
         return None
     
+    def to_dataframe(self):
+        """
+        Convert scraped products into a DataFrame with one typed column per field.
+        
+        Returns:
+            pandas DataFrame with the PRODUCT_COLUMNS fields, missing values as NA,
+            and the raw spec table as JSON in a "specifications" column
+        """
+        # Imported here so the API does not pay for pandas unless it is used
+        import pandas as pd
+        
+        columns = {}
+        for column, section, field, dtype in PRODUCT_COLUMNS:
+            if section is None:
+                values = [product.get(field) for product in self.products]
+            else:
+                values = [(product.get(section) or {}).get(field) for product in self.products]
+            columns[column] = pd.array(values, dtype=dtype)
+        
+        columns["specifications"] = pd.array(
+            [json.dumps(product.get("specifications", {})) for product in self.products],
+            dtype="string"
+        )
+        return pd.DataFrame(columns)
+    
     def save_products(self, filename: str) -> None:
         """
         Save scraped products to a JSON file.
@@ -110,16 +477,10 @@ class ProductScraper:
             return
             
         try:
-            output_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
-            os.makedirs(output_dir, exist_ok=True)
-            
-            filepath = os.path.join(output_dir, filename)
-            with open(filepath, 'w') as f:
-                json.dump({
-                    'products': self.products,
-                    'errors': self.errors,
-                    'scraped_at': datetime.now().isoformat()
-                }, f, indent=2)
+            filepath = save_json_products(filename, self.products, {
+                'errors': self.errors,
+                'scraped_at': self.scraped_at or datetime.now().isoformat()
+            })
             
             logger.info(f"Saved {len(self.products)} products to {filepath}")
         except Exception as e:
@@ -141,14 +502,14 @@ class NvidiaProductScraper(ProductScraper):
         Returns:
             List of product URLs
         """
-        soup = self.get_page(NVIDIA_PRODUCTS_URL)
+        soup = self.get_page(NVIDIA_PRODUCTS_URL, parse_only=LINK_STRAINER)
         if not soup:
             return []
         
         product_urls = []
         
         # For each product card/link on the page
-        for link in soup.select('a[href*="/data-center/products/"]'):
+        for link in NVIDIA_PRODUCT_LINK_SELECTOR.select(soup):
             url = link.get('href')
             if url and 'gpu' in url.lower() and url != NVIDIA_PRODUCTS_URL:
                 # Ensure it's an absolute URL
@@ -157,18 +518,18 @@ class NvidiaProductScraper(ProductScraper):
                 product_urls.append(url)
         
         # Remove duplicates while preserving order
-        seen = set()
-        self.product_urls = [url for url in product_urls if not (url in seen or seen.add(url))]
+        self.product_urls = list(dict.fromkeys(product_urls))
         
         logger.info(f"Found {len(self.product_urls)} NVIDIA product URLs")
         return self.product_urls
     
-    def extract_product_info(self, url: str) -> Optional[Dict[str, Any]]:
+    def extract_product_info(self, url: str, scraped_at: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Extract product information from a product page.
         
         Args:
             url: The URL of the product page
+            scraped_at: ISO timestamp of the scrape run, defaults to now
             
         Returns:
             Dictionary containing product information
@@ -188,7 +549,7 @@ class NvidiaProductScraper(ProductScraper):
             "price": 0,  # Price typically not available on manufacturer sites
             "warranty": "Standard manufacturer warranty",
             "dataSourceUrl": url,
-            "lastPriceUpdate": datetime.now().isoformat(),
+            "lastPriceUpdate": scraped_at or datetime.now().isoformat(),
             "computeSpecs": {},
             "memorySpecs": {},
             "powerConsumption": {},
@@ -199,91 +560,41 @@ class NvidiaProductScraper(ProductScraper):
             "model": ""
         }
         
-        # Extract product name
+        # One handler for the whole page: a failure keeps whatever was
+        # extracted before it
         try:
-            name_elem = soup.select_one('h1')
+            # Extract product name
+            name_elem = soup.find('h1')
             if name_elem:
                 product["name"] = self.clean_text(name_elem.text)
                 # Extract model number from name
                 if "NVIDIA" in product["name"]:
-                    model_match = re.search(r'NVIDIA\s+([A-Z0-9-]+)', product["name"])
+                    model_match = NVIDIA_MODEL_PATTERN.search(product["name"])
                     if model_match:
                         product["model"] = model_match.group(1)
-        except Exception as e:
-            logger.error(f"Error extracting product name from {url}: {str(e)}")
-        
-        # Extract product description
-        try:
-            desc_elem = soup.select_one('meta[name="description"]')
+            
+            # Extract product description
+            desc_elem = DESCRIPTION_SELECTOR.select_one(soup)
             if desc_elem:
                 product["description"] = self.clean_text(desc_elem.get('content', ''))
-        except Exception as e:
-            logger.error(f"Error extracting product description from {url}: {str(e)}")
-        
-        # Extract specifications
-        try:
-            spec_tables = soup.select('table.specs-table')
-            for table in spec_tables:
-                rows = table.select('tr')
-                for row in rows:
-                    cells = row.select('td')
+            
+            # Extract specifications; find_all walks the tree directly, without
+            # going through the CSS selector engine for every table and row
+            for table in soup.find_all('table', class_='specs-table'):
+                for row in table.find_all('tr'):
+                    cells = row.find_all('td')
                     if len(cells) >= 2:
                         key = self.clean_text(cells[0].text)
                         value = self.clean_text(cells[1].text)
                         if key and value:
                             product["specifications"][key] = value
-                            
-                            # Extract architecture
-                            if 'architecture' in key.lower():
-                                product["architecture"] = value
-                            
-                            # Extract compute performance
-                            elif 'cuda cores' in key.lower():
-                                product["computeSpecs"]["cudaCores"] = self.extract_number(value)
-                            elif 'tensor cores' in key.lower():
-                                product["computeSpecs"]["tensorCores"] = self.extract_number(value)
-                            elif 'fp32' in key.lower() and 'performance' in key.lower():
-                                product["computeSpecs"]["fp32Performance"] = self.extract_number(value)
-                            elif 'fp16' in key.lower() and 'performance' in key.lower():
-                                product["computeSpecs"]["fp16Performance"] = self.extract_number(value)
-                            elif 'int8' in key.lower() and 'performance' in key.lower():
-                                product["computeSpecs"]["int8Performance"] = self.extract_number(value)
-                            elif 'clock' in key.lower():
-                                product["computeSpecs"]["clockSpeed"] = self.extract_number(value)
-                            
-                            # Extract memory specifications
-                            elif 'memory' in key.lower() and 'size' in key.lower():
-                                memory_size = self.extract_number(value)
-                                if memory_size:
-                                    product["memorySpecs"]["capacity"] = memory_size
-                            elif 'memory' in key.lower() and 'bandwidth' in key.lower():
-                                bandwidth = self.extract_number(value)
-                                if bandwidth:
-                                    product["memorySpecs"]["bandwidth"] = bandwidth
-                            elif 'memory' in key.lower() and 'type' in key.lower():
-                                product["memorySpecs"]["type"] = value
-                            elif 'memory' in key.lower() and 'bus' in key.lower():
-                                bus_width = self.extract_number(value)
-                                if bus_width:
-                                    product["memorySpecs"]["busWidth"] = bus_width
-                            elif 'ecc' in key.lower():
-                                product["memorySpecs"]["eccSupport"] = 'yes' in value.lower()
-                            
-                            # Extract power consumption
-                            elif 'tdp' in key.lower() or 'power' in key.lower():
-                                tdp = self.extract_number(value)
-                                if tdp:
-                                    product["powerConsumption"]["tdp"] = tdp
-        except Exception as e:
-            logger.error(f"Error extracting specifications from {url}: {str(e)}")
-        
-        # Extract supported frameworks
-        try:
+                            self.apply_spec(product, key, value)
+            
+            # Extract supported frameworks
             frameworks = []
-            frameworks_section = soup.select_one('section:contains("frameworks")')
+            frameworks_section = FRAMEWORKS_SECTION_SELECTOR.select_one(soup)
             if frameworks_section:
-                framework_items = frameworks_section.select('li')
-                for item in framework_items:
+                for item in frameworks_section.find_all('li'):
                     framework = self.clean_text(item.text)
                     if framework:
                         frameworks.append(framework)
@@ -296,7 +607,7 @@ class NvidiaProductScraper(ProductScraper):
                     "TensorFlow", "PyTorch", "CUDA", "RAPIDS", "TensorRT"
                 ]
         except Exception as e:
-            logger.error(f"Error extracting frameworks from {url}: {str(e)}")
+            logger.error(f"Error extracting product information from {url}: {str(e)}")
         
         # Set defaults for required fields if not found
         if not product["memorySpecs"]:
@@ -314,6 +625,34 @@ class NvidiaProductScraper(ProductScraper):
             
         return product
     
+    def apply_spec(self, product: Dict[str, Any], key: str, value: str) -> None:
+        """
+        Copy a spec table row into the structured product fields it describes.
+        
+        Args:
+            product: Product dictionary to update
+            key: Cleaned spec name, e.g. "Peak FP32 Performance"
+            value: Cleaned spec value, e.g. "60 TFLOPS"
+        """
+        spec_field = nvidia_spec_field(key)
+        if spec_field is None:
+            return
+        
+        section, field, kind = spec_field
+        if kind == 'text':
+            parsed = value
+        elif kind == 'flag':
+            parsed = 'yes' in value.lower()
+        else:
+            parsed = self.extract_number(value)
+            if kind == 'positive' and not parsed:
+                return
+        
+        if section is None:
+            product[field] = parsed
+        else:
+            product[section][field] = parsed
+    
     def scrape_products(self) -> List[Dict[str, Any]]:
         """
         Scrape all NVIDIA GPU products.
@@ -324,11 +663,7 @@ class NvidiaProductScraper(ProductScraper):
         if not self.product_urls:
             self.get_all_product_urls()
         
-        for url in self.product_urls:
-            logger.info(f"Scraping product from {url}")
-            product_info = self.extract_product_info(url)
-            if product_info:
-                self.products.append(product_info)
+        self.products.extend(self.extract_products(self.product_urls))
         
         return self.products
 
@@ -348,7 +683,7 @@ class AmdProductScraper(ProductScraper):
         Returns:
             List of product URLs
         """
-        soup = self.get_page(AMD_PRODUCTS_URL)
+        soup = self.get_page(AMD_PRODUCTS_URL, parse_only=LINK_STRAINER)
         if not soup:
             return []
         
@@ -356,7 +691,7 @@ class AmdProductScraper(ProductScraper):
         
         # This is a placeholder - actual implementation would need to be
         # customized to AMD's website structure
-        for link in soup.select('a[href*="/products/graphics/"]'):
+        for link in AMD_PRODUCT_LINK_SELECTOR.select(soup):
             url = link.get('href')
             if url and ('server' in url.lower() or 'data-center' in url.lower()):
                 # Ensure it's an absolute URL
@@ -365,18 +700,18 @@ class AmdProductScraper(ProductScraper):
                 product_urls.append(url)
         
         # Remove duplicates while preserving order
-        seen = set()
-        self.product_urls = [url for url in product_urls if not (url in seen or seen.add(url))]
+        self.product_urls = list(dict.fromkeys(product_urls))
         
         logger.info(f"Found {len(self.product_urls)} AMD product URLs")
         return self.product_urls
     
-    def extract_product_info(self, url: str) -> Optional[Dict[str, Any]]:
+    def extract_product_info(self, url: str, scraped_at: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Extract product information from a product page.
         
         Args:
             url: The URL of the product page
+            scraped_at: ISO timestamp of the scrape run, defaults to now
             
         Returns:
             Dictionary containing product information
@@ -398,7 +733,7 @@ class AmdProductScraper(ProductScraper):
             "price": 0,
             "warranty": "Standard manufacturer warranty",
             "dataSourceUrl": url,
-            "lastPriceUpdate": datetime.now().isoformat(),
+            "lastPriceUpdate": scraped_at or datetime.now().isoformat(),
             "computeSpecs": {},
             "memorySpecs": {},
             "powerConsumption": {},
@@ -424,55 +759,60 @@ class AmdProductScraper(ProductScraper):
         if not self.product_urls:
             self.get_all_product_urls()
         
-        for url in self.product_urls:
-            logger.info(f"Scraping product from {url}")
-            product_info = self.extract_product_info(url)
-            if product_info:
-                self.products.append(product_info)
+        self.products.extend(self.extract_products(self.product_urls))
         
         return self.products
 
 
-def scrape_all_products() -> Dict[str, List[Dict[str, Any]]]:
+# Scraper class and output file for each supported manufacturer
+MANUFACTURER_SCRAPERS = {
+    "NVIDIA": (NvidiaProductScraper, "nvidia_products.json"),
+    "AMD": (AmdProductScraper, "amd_products.json"),
+}
+
+
+def scrape_manufacturer_products(manufacturer: str) -> List[Dict[str, Any]]:
     """
-    Scrape products from all supported manufacturers.
+    Scrape and save the products of one manufacturer.
     
+    Args:
+        manufacturer: Manufacturer name, a key of MANUFACTURER_SCRAPERS
+        
     Returns:
-        Dictionary with manufacturer names as keys and lists of products as values
+        List of product dictionaries, empty if scraping failed
     """
-    all_products = {}
-    
-    # NVIDIA products
+    scraper_class, filename = MANUFACTURER_SCRAPERS[manufacturer]
     try:
-        nvidia_scraper = NvidiaProductScraper()
-        nvidia_products = nvidia_scraper.scrape_products()
-        nvidia_scraper.save_products("nvidia_products.json")
-        all_products["NVIDIA"] = nvidia_products
+        scraper = scraper_class()
+        products = scraper.scrape_products()
+        scraper.save_products(filename)
+        return products
     except Exception as e:
-        logger.error(f"Error scraping NVIDIA products: {str(e)}")
-        all_products["NVIDIA"] = []
+        logger.error(f"Error scraping {manufacturer} products: {str(e)}")
+        return []
+
+
+def scrape_all_products() -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Scrape products from all supported manufacturers.
     
-    # AMD products
-    try:
-        amd_scraper = AmdProductScraper()
-        amd_products = amd_scraper.scrape_products()
-        amd_scraper.save_products("amd_products.json")
-        all_products["AMD"] = amd_products
-    except Exception as e:
-        logger.error(f"Error scraping AMD products: {str(e)}")
-        all_products["AMD"] = []
+    Returns:
+        Dictionary with manufacturer names as keys and lists of products as values
+    """
+    # The manufacturers' sites are independent, so scrape them side by side
+    with ThreadPoolExecutor(max_workers=len(MANUFACTURER_SCRAPERS)) as executor:
+        all_products = dict(zip(
+            MANUFACTURER_SCRAPERS,
+            executor.map(scrape_manufacturer_products, MANUFACTURER_SCRAPERS)
+        ))
     
     # Save combined products
     try:
-        output_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
-        os.makedirs(output_dir, exist_ok=True)
-        
-        filepath = os.path.join(output_dir, "all_products.json")
-        with open(filepath, 'w') as f:
-            json.dump({
-                'products': [p for mfg_products in all_products.values() for p in mfg_products],
-                'scraped_at': datetime.now().isoformat()
-            }, f, indent=2)
+        filepath = save_json_products(
+            "all_products.json",
+            itertools.chain.from_iterable(all_products.values()),
+            {'scraped_at': datetime.now().isoformat()}
+        )
         
         total_products = sum(len(products) for products in all_products.values())
         logger.info(f"Saved {total_products} products to {filepath}")
@@ -777,26 +1117,41 @@ async def store_products_in_database(products: List[Dict[str, Any]]) -> None:
     Args:
         products: List of product dictionaries to store
     """
+    # The ORM calls block, so keep them off the event loop
+    await asyncio.to_thread(_store_products, products)
+
+
+def _store_products(products: List[Dict[str, Any]]) -> None:
+    """
+    Create or update suppliers and products in a single transaction.
+    
+    Existing suppliers and products are loaded with one query each rather
+    than looked up per product.
+    
+    Args:
+        products: List of product dictionaries to store
+    """
+    from python_backend.models.database import Product, Supplier, get_db
+    
+    db = next(get_db())
     try:
-        from python_backend.models.database import Product, Supplier, get_db
-        
-        db = next(get_db())
+        manufacturers = {product_data["manufacturer"] for product_data in products}
+        suppliers = {
+            supplier.name: supplier
+            for supplier in db.query(Supplier).filter(Supplier.name.in_(manufacturers))
+        }
         
-        # For each product, create or update the supplier and the product
+        # Create the missing suppliers, then flush once so they get their ids
         for product_data in products:
-            # Check if supplier exists, create if not
-            supplier = db.query(Supplier).filter(
-                Supplier.name == product_data["manufacturer"]
-            ).first()
-            
-            if not supplier:
+            manufacturer = product_data["manufacturer"]
+            if manufacturer not in suppliers:
                 supplier = Supplier(
-                    name=product_data["manufacturer"],
+                    name=manufacturer,
                     country="United States",  # Default, should be updated with actual data
                     description=f"Manufacturer of {product_data['category']} products",
-                    website=f"https://www.{product_data['manufacturer'].lower()}.com",
-                    logoUrl=f"/images/suppliers/{product_data['manufacturer'].lower()}.png",
-                    contactEmail=f"info@{product_data['manufacturer'].lower()}.com",
+                    website=f"https://www.{manufacturer.lower()}.com",
+                    logoUrl=f"/images/suppliers/{manufacturer.lower()}.png",
+                    contactEmail=f"info@{manufacturer.lower()}.com",
                     contactPhone="+1-555-555-5555",
                     deliveryTime="4-6 weeks",
                     isVerified=True,
@@ -805,22 +1160,31 @@ async def store_products_in_database(products: List[Dict[str, Any]]) -> None:
                     leadTime=product_data.get("leadTime", 30)
                 )
                 db.add(supplier)
-                db.commit()
-                db.refresh(supplier)
-            
-            # Check if product exists, create if not, update if it does
-            existing_product = db.query(Product).filter(
-                Product.name == product_data["name"],
-                Product.supplier_id == supplier.id
-            ).first()
+                suppliers[manufacturer] = supplier
+        db.flush()
+        
+        supplier_ids = [supplier.id for supplier in suppliers.values()]
+        names = {product_data["name"] for product_data in products}
+        existing_products = {
+            (product.name, product.supplier_id): product
+            for product in db.query(Product).filter(
+                Product.supplier_id.in_(supplier_ids),
+                Product.name.in_(names)
+            )
+        }
+        
+        # For each product, update it if it exists, create it otherwise
+        for product_data in products:
+            supplier = suppliers[product_data["manufacturer"]]
+            key = (product_data["name"], supplier.id)
+            existing_product = existing_products.get(key)
             
             if existing_product:
                 # Update existing product
-                for key, value in product_data.items():
-                    if hasattr(existing_product, key) and key != 'id':
-                        setattr(existing_product, key, value)
+                for field, value in product_data.items():
+                    if hasattr(existing_product, field) and field != 'id':
+                        setattr(existing_product, field, value)
                 
-                db.commit()
                 logger.info(f"Updated product: {product_data['name']}")
             else:
                 # Create new product
@@ -848,13 +1212,16 @@ async def store_products_in_database(products: List[Dict[str, Any]]) -> None:
                     data_source_url=product_data.get("dataSourceUrl", "")
                 )
                 db.add(new_product)
-                db.commit()
+                existing_products[key] = new_product
                 logger.info(f"Created product: {product_data['name']}")
         
+        db.commit()
     except Exception as e:
+        db.rollback()
         logger.error(f"Error storing products in database: {str(e)}")
         raise
-
+    finally:
+        db.close()
 
 if __name__ == "__main__":
     # For testing purposes
@@ -862,14 +1229,9 @@ if __name__ == "__main__":
     print(f"Created {len(products)} sample products")
     
     # Save sample products to file
-    output_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
-    os.makedirs(output_dir, exist_ok=True)
-    
-    filepath = os.path.join(output_dir, "sample_products.json")
-    with open(filepath, 'w') as f:
-        json.dump({
-            'products': products,
-            'scraped_at': datetime.now().isoformat()
-        }, f, indent=2)
+    filepath = save_json("sample_products.json", {
+        'products': products,
+        'scraped_at': datetime.now().isoformat()
+    })
     
     print(f"Saved sample products to {filepath}")
\ No newline at end of file
@@ -6,6 +6,7 @@ based on various criteria including price, quality, and delivery time.
 It now includes semantic search capabilities using vector embeddings.
 """
 
+import functools
 import re
 import logging
 from typing import List, Dict, Any, Tuple, Optional
@@ -22,6 +23,40 @@ logger = logging.getLogger(__name__)
 # Initialize database storage
 db_storage = DatabaseStorage()
 
+# Spec parsing patterns, compiled once instead of looked up in re's cache on
+# every comparison
+NUMBER_PATTERN = re.compile(r'\d+')
+INTEL_GENERATION_PATTERN = re.compile(r'i(\d+)')
+RYZEN_SERIES_PATTERN = re.compile(r'ryzen\s*(\d+)')
+GB_PATTERN = re.compile(r'(\d+)\s*gb', re.IGNORECASE)
+TB_PATTERN = re.compile(r'(\d+(\.\d+)?)\s*tb')
+DDR_PATTERN = re.compile(r'ddr(\d)', re.IGNORECASE)
+DISPLAY_SIZE_PATTERN = re.compile(r'(\d+(\.\d+)?)["\'-]?\s*(inch|in)?')
+WARRANTY_YEARS_PATTERN = re.compile(r'(\d+)\s*(year|yr)', re.IGNORECASE)
+
+# Comparisons are pure functions of the requirement and spec strings, and the
+# same catalog specs are compared again for every RFQ, so their results are
+# cached instead of re-parsed. Delivery times are cached the same way, as every
+# product of a supplier shares one
+COMPARISON_CACHE_SIZE = 4096
+
+# Display resolution markers and their scores, matched as substrings in order
+RESOLUTION_SCORES = {
+    'hd': 0.6,
+    '1366': 0.6,
+    '768': 0.6,
+    'fhd': 0.8,
+    '1080': 0.8,
+    '1920': 0.8,
+    'qhd': 0.9,
+    '1440': 0.9,
+    '2560': 0.9,
+    '4k': 1.0,
+    'uhd': 1.0,
+    '2160': 1.0,
+    '3840': 1.0
+}
+
 def ensure_extracted_requirement(requirements: Any) -> ExtractedRequirement:
     """
     Ensure that requirements are in the correct ExtractedRequirement format.
@@ -61,13 +96,14 @@ def ensure_extracted_requirement(requirements: Any) -> ExtractedRequirement:
         )
     )
 
+@functools.lru_cache(maxsize=1024)
 def parse_delivery_time(delivery_time: str) -> float:
     """Parse delivery time string to get average days"""
     if not delivery_time:
         return 30.0
     
     # Try to extract numbers from the delivery time string
-    numbers = re.findall(r'\d+', delivery_time)
+    numbers = NUMBER_PATTERN.findall(delivery_time)
     if not numbers:
         return 30.0
     
@@ -78,6 +114,7 @@ def parse_delivery_time(delivery_time: str) -> float:
     # If there's just one number, use that
     return float(numbers[0])
 
+@functools.lru_cache(maxsize=COMPARISON_CACHE_SIZE)
 def compare_processors(requirement: str, spec: str) -> float:
     """Compare processor specifications and return a score between 0 and 1"""
     if not requirement or not spec:
@@ -91,8 +128,8 @@ def compare_processors(requirement: str, spec: str) -> float:
         return 1.0
     
     # Extract processor generation and model information
-    req_gen = re.search(r'i(\d+)', req_lower)
-    spec_gen = re.search(r'i(\d+)', spec_lower)
+    req_gen = INTEL_GENERATION_PATTERN.search(req_lower)
+    spec_gen = INTEL_GENERATION_PATTERN.search(spec_lower)
     
     # Compare Intel Core i-series processors
     if req_gen and spec_gen:
@@ -108,8 +145,8 @@ def compare_processors(requirement: str, spec: str) -> float:
             return max(0.5, 1.0 - (req_i - spec_i) * 0.2)  # Deduct 20% per generation below
     
     # Compare AMD Ryzen processors
-    req_ryzen = re.search(r'ryzen\s*(\d+)', req_lower)
-    spec_ryzen = re.search(r'ryzen\s*(\d+)', spec_lower)
+    req_ryzen = RYZEN_SERIES_PATTERN.search(req_lower)
+    spec_ryzen = RYZEN_SERIES_PATTERN.search(spec_lower)
     
     if req_ryzen and spec_ryzen:
         req_r = int(req_ryzen.group(1))
@@ -132,14 +169,15 @@ def compare_processors(requirement: str, spec: str) -> float:
     # Default score for other cases
     return 0.6
 
+@functools.lru_cache(maxsize=COMPARISON_CACHE_SIZE)
 def compare_memory(requirement: str, spec: str) -> float:
     """Compare memory specifications and return a score between 0 and 1"""
     if not requirement or not spec:
         return 0.5
     
     # Extract memory size in GB
-    req_size = re.search(r'(\d+)\s*gb', requirement.lower())
-    spec_size = re.search(r'(\d+)\s*gb', spec.lower())
+    req_size = GB_PATTERN.search(requirement)
+    spec_size = GB_PATTERN.search(spec)
     
     if req_size and spec_size:
         req_gb = int(req_size.group(1))
@@ -154,8 +192,8 @@ def compare_memory(requirement: str, spec: str) -> float:
             return max(0.5, 1.0 - ((req_gb - spec_gb) / 4) * 0.2)
     
     # Check for DDR type
-    req_ddr = re.search(r'ddr(\d)', requirement.lower())
-    spec_ddr = re.search(r'ddr(\d)', spec.lower())
+    req_ddr = DDR_PATTERN.search(requirement)
+    spec_ddr = DDR_PATTERN.search(spec)
     
     if req_ddr and spec_ddr:
         req_ver = int(req_ddr.group(1))
@@ -172,6 +210,7 @@ def compare_memory(requirement: str, spec: str) -> float:
     # Default score for other cases
     return 0.6
 
+@functools.lru_cache(maxsize=COMPARISON_CACHE_SIZE)
 def compare_storage(requirement: str, spec: str) -> float:
     """Compare storage specifications and return a score between 0 and 1"""
     if not requirement or not spec:
@@ -181,12 +220,12 @@ def compare_storage(requirement: str, spec: str) -> float:
     spec_lower = spec.lower()
     
     # Convert TB to GB for comparison
-    req_tb = re.search(r'(\d+(\.\d+)?)\s*tb', req_lower)
-    spec_tb = re.search(r'(\d+(\.\d+)?)\s*tb', spec_lower)
+    req_tb = TB_PATTERN.search(req_lower)
+    spec_tb = TB_PATTERN.search(spec_lower)
     
     # Extract GB values
-    req_gb = re.search(r'(\d+)\s*gb', req_lower)
-    spec_gb = re.search(r'(\d+)\s*gb', spec_lower)
+    req_gb = GB_PATTERN.search(req_lower)
+    spec_gb = GB_PATTERN.search(spec_lower)
     
     # Calculate storage sizes in GB
     req_size_gb = 0
@@ -222,6 +261,7 @@ def compare_storage(requirement: str, spec: str) -> float:
     # Combine scores (size is more important than type)
     return size_score * 0.7 + spec_type_score * 0.3
 
+@functools.lru_cache(maxsize=COMPARISON_CACHE_SIZE)
 def compare_display(requirement: str, spec: str) -> float:
     """Compare display specifications and return a score between 0 and 1"""
     if not requirement or not spec:
@@ -231,25 +271,8 @@ def compare_display(requirement: str, spec: str) -> float:
     spec_lower = spec.lower()
     
     # Extract display size
-    req_size = re.search(r'(\d+(\.\d+)?)["\'-]?\s*(inch|in)?', req_lower)
-    spec_size = re.search(r'(\d+(\.\d+)?)["\'-]?\s*(inch|in)?', spec_lower)
-    
-    # Extract resolution
-    res_scores = {
-        'hd': 0.6,
-        '1366': 0.6,
-        '768': 0.6,
-        'fhd': 0.8,
-        '1080': 0.8,
-        '1920': 0.8,
-        'qhd': 0.9,
-        '1440': 0.9,
-        '2560': 0.9,
-        '4k': 1.0,
-        'uhd': 1.0,
-        '2160': 1.0,
-        '3840': 1.0
-    }
+    req_size = DISPLAY_SIZE_PATTERN.search(req_lower)
+    spec_size = DISPLAY_SIZE_PATTERN.search(spec_lower)
     
     # Calculate size score
     size_score = 0.7
@@ -264,30 +287,35 @@ def compare_display(requirement: str, spec: str) -> float:
             # Deduct 10% for each inch difference, but not below 0.5
             size_score = max(0.5, 1.0 - abs(spec_inches - req_inches) * 0.1)
     
+    # Find the resolution markers in each string once, in table order
+    req_keys = [key for key in RESOLUTION_SCORES if key in req_lower]
+    spec_keys = [key for key in RESOLUTION_SCORES if key in spec_lower]
+    
     # Calculate resolution score
     res_score = 0.7  # Default
-    for key, score in res_scores.items():
-        if key in req_lower and key in spec_lower:
-            res_score = score
+    for key in spec_keys:
+        if key in req_keys:
+            res_score = RESOLUTION_SCORES[key]
             break
-        elif key in spec_lower and key not in req_lower:
-            # Higher resolution than required is good
-            for req_key, req_score in res_scores.items():
-                if req_key in req_lower and res_scores[key] > req_score:
-                    res_score = min(1.0, req_score + 0.1)  # Slight bonus for better resolution
-                    break
+        # Higher resolution than required is good
+        for req_key in req_keys:
+            req_score = RESOLUTION_SCORES[req_key]
+            if RESOLUTION_SCORES[key] > req_score:
+                res_score = min(1.0, req_score + 0.1)  # Slight bonus for better resolution
+                break
     
     # Combine scores (resolution is more important than exact size)
     return size_score * 0.4 + res_score * 0.6
 
+@functools.lru_cache(maxsize=COMPARISON_CACHE_SIZE)
 def compare_warranty(requirement: str, spec: str) -> float:
     """Compare warranty specifications and return a score between 0 and 1"""
     if not requirement or not spec:
         return 0.5
     
     # Extract warranty duration in years
-    req_years = re.search(r'(\d+)\s*(year|yr)', requirement.lower())
-    spec_years = re.search(r'(\d+)\s*(year|yr)', spec.lower())
+    req_years = WARRANTY_YEARS_PATTERN.search(requirement)
+    spec_years = WARRANTY_YEARS_PATTERN.search(spec)
     
     # Calculate warranty period score
     if req_years and spec_years:
@@ -302,10 +330,11 @@ def compare_warranty(requirement: str, spec: str) -> float:
     
     # Check warranty type (onsite is better than return-to-base)
     warranty_type_score = 0.6  # Default
+    spec_lower = spec.lower()
     
-    if 'onsite' in spec.lower():
+    if 'onsite' in spec_lower:
         warranty_type_score = 0.9
-    if 'next day' in spec.lower() or 'nbd' in spec.lower():
+    if 'next day' in spec_lower or 'nbd' in spec_lower:
         warranty_type_score = 1.0
     
     return warranty_type_score
@@ -315,19 +344,21 @@ def calculate_match_score(product: Product, supplier: Supplier, requirements: Ex
     # Get category-specific requirements
     category_req = None
     specs = product.specifications if isinstance(product.specifications, dict) else {}
+    category_lower = category.lower()
     
-    if category.lower() == "laptops" and hasattr(requirements, "laptops") and requirements.laptops:
-        category_req = requirements.laptops
-    elif category.lower() == "monitors" and hasattr(requirements, "monitors") and requirements.monitors:
-        category_req = requirements.monitors
+    if category_lower == "laptops":
+        category_req = getattr(requirements, "laptops", None)
+    elif category_lower == "monitors":
+        category_req = getattr(requirements, "monitors", None)
     
     if not category_req:
         return 50.0, {"price": 50.0, "quality": 50.0, "delivery": 50.0}
     
     # Get criteria weights
-    price_weight = requirements.criteria.price.get("weight", 50) if hasattr(requirements, "criteria") else 50
-    quality_weight = requirements.criteria.quality.get("weight", 30) if hasattr(requirements, "criteria") else 30
-    delivery_weight = requirements.criteria.delivery.get("weight", 20) if hasattr(requirements, "criteria") else 20
+    criteria = getattr(requirements, "criteria", None)
+    price_weight = criteria.price.get("weight", 50) if criteria else 50
+    quality_weight = criteria.quality.get("weight", 30) if criteria else 30
+    delivery_weight = criteria.delivery.get("weight", 20) if criteria else 20
     
     # Calculate price score (lower price is better)
     price_score = 50.0  # Default mid-range score
@@ -347,55 +378,55 @@ def calculate_match_score(product: Product, supplier: Supplier, requirements: Ex
     quality_score = 50.0  # Default mid-range score
     quality_factors = []
     
-    if category.lower() == "laptops":
+    if category_lower == "laptops":
         # Processor comparison
-        if hasattr(category_req, "processor") and "processor" in specs:
+        if "processor" in specs:
             proc_score = compare_processors(category_req.processor, specs["processor"]) * 100
             quality_factors.append(("processor", proc_score))
         
         # Memory comparison
-        if hasattr(category_req, "memory") and "memory" in specs:
+        if "memory" in specs:
             mem_score = compare_memory(category_req.memory, specs["memory"]) * 100
             quality_factors.append(("memory", mem_score))
         
         # Storage comparison
-        if hasattr(category_req, "storage") and "storage" in specs:
+        if "storage" in specs:
             storage_score = compare_storage(category_req.storage, specs["storage"]) * 100
             quality_factors.append(("storage", storage_score))
         
         # Display comparison
-        if hasattr(category_req, "display") and "display" in specs:
+        if "display" in specs:
             display_score = compare_display(category_req.display, specs["display"]) * 100
             quality_factors.append(("display", display_score))
         
         # Warranty comparison
-        if hasattr(category_req, "warranty") and hasattr(product, "warranty"):
-            warranty_score = compare_warranty(category_req.warranty, product.warranty) * 100
-            quality_factors.append(("warranty", warranty_score))
+        warranty_score = compare_warranty(category_req.warranty, product.warranty) * 100
+        quality_factors.append(("warranty", warranty_score))
     
-    elif category.lower() == "monitors":
+    elif category_lower == "monitors":
         # Screen size and resolution comparisons
-        if hasattr(category_req, "screenSize") and "screenSize" in specs:
+        if "screenSize" in specs:
             screen_score = compare_display(category_req.screenSize, specs["screenSize"]) * 100
             quality_factors.append(("screenSize", screen_score))
         
-        if hasattr(category_req, "resolution") and "resolution" in specs:
+        if "resolution" in specs:
             res_score = compare_display(category_req.resolution, specs["resolution"]) * 100
             quality_factors.append(("resolution", res_score))
         
         # Panel technology comparison
-        if hasattr(category_req, "panelTech") and "panelTech" in specs:
+        if "panelTech" in specs:
             panel_score = 70.0  # Default
-            if specs["panelTech"].lower() == category_req.panelTech.lower():
+            spec_panel = specs["panelTech"].lower()
+            req_panel = category_req.panelTech.lower()
+            if spec_panel == req_panel:
                 panel_score = 100.0
-            elif "ips" in specs["panelTech"].lower() and not "ips" in category_req.panelTech.lower():
+            elif "ips" in spec_panel and not "ips" in req_panel:
                 panel_score = 90.0  # IPS is generally better than other panels
             quality_factors.append(("panelTech", panel_score))
         
         # Warranty comparison
-        if hasattr(category_req, "warranty") and hasattr(product, "warranty"):
-            warranty_score = compare_warranty(category_req.warranty, product.warranty) * 100
-            quality_factors.append(("warranty", warranty_score))
+        warranty_score = compare_warranty(category_req.warranty, product.warranty) * 100
+        quality_factors.append(("warranty", warranty_score))
     
     # Calculate average quality score from all factors
     if quality_factors:
@@ -435,29 +466,33 @@ def calculate_match_score(product: Product, supplier: Supplier, requirements: Ex
         "delivery": delivery_score
     }
 
-async def get_quantity_for_category(requirements: Any, category: str) -> int:
+def get_quantity_for_category(requirements: Any, category: str) -> int:
     """Get quantity from requirements for a specific category"""
     try:
         # Ensure we have an ExtractedRequirement object
         req_obj = ensure_extracted_requirement(requirements)
+        category_lower = category.lower()
         
-        if category.lower() == "laptops" and hasattr(req_obj, "laptops") and req_obj.laptops:
-            return req_obj.laptops.quantity
-        elif category.lower() == "monitors" and hasattr(req_obj, "monitors") and req_obj.monitors:
-            return req_obj.monitors.quantity
+        category_req = None
+        if category_lower == "laptops":
+            category_req = getattr(req_obj, "laptops", None)
+        elif category_lower == "monitors":
+            category_req = getattr(req_obj, "monitors", None)
+        if category_req:
+            return category_req.quantity
             
         # Try dict-style access if attribute access doesn't work
         if isinstance(requirements, dict):
-            if category.lower() == "laptops" and "laptops" in requirements and requirements["laptops"]:
+            if category_lower == "laptops" and "laptops" in requirements and requirements["laptops"]:
                 return requirements["laptops"].get("quantity", 1)
-            elif category.lower() == "monitors" and "monitors" in requirements and requirements["monitors"]:
+            elif category_lower == "monitors" and "monitors" in requirements and requirements["monitors"]:
                 return requirements["monitors"].get("quantity", 1)
     except Exception as e:
         logger.error(f"Error getting quantity for category {category}: {str(e)}")
     
     return 1  # Default quantity
 
-async def calculate_price_score(product: Product, all_products: List[Product], criteria: Dict[str, Dict[str, int]]) -> float:
+def calculate_price_score(product: Product, all_products: List[Product], criteria: Dict[str, Dict[str, int]]) -> float:
     """Calculate price score compared to other products in the same category"""
     if not all_products:
         return 50.0
@@ -502,7 +537,7 @@ async def match_suppliers_for_rfq(rfq_id: int) -> List[SupplierMatch]:
         if isinstance(requirements, str):
             try:
                 requirements = json.loads(requirements)
-            except:
+            except ValueError:
                 logger.error(f"Failed to parse requirements for RFQ {rfq_id}")
                 return []
         
@@ -519,13 +554,19 @@ async def match_suppliers_for_rfq(rfq_id: int) -> List[SupplierMatch]:
         use_vector_search = True  # Flag to control whether to use vector search
         
         for category in categories:
-            # Step 1: Index all products in vector database for semantic search
-            all_products = await db_storage.get_products_by_category(category)
+            # Step 1: Index all products in vector database for semantic search.
+            # Suppliers come with their products rather than one query each
+            products_with_suppliers = await db_storage.get_products_with_suppliers_by_category(category)
+            all_products = [product for product, _ in products_with_suppliers]
+            products_by_id = {product.id: (product, supplier) for product, supplier in products_with_suppliers}
             
             if not all_products:
                 logger.warning(f"No products found for category {category}")
                 continue
             
+            # The quantity is the same for every product of the category
+            quantity = get_quantity_for_category(req_obj, category)
+            
             # Convert products to dict format for vector indexing
             products_for_indexing = []
             for product in all_products:
@@ -607,12 +648,17 @@ async def match_suppliers_for_rfq(rfq_id: int) -> List[SupplierMatch]:
                                 if not isinstance(product_id, int):
                                     product_id = int(product_id)
                                 
-                                product = await db_storage.get_product_by_id(product_id)
-                                if not product:
-                                    logger.warning(f"Product not found for id {product_id}")
-                                    continue
+                                if product_id in products_by_id:
+                                    product, supplier = products_by_id[product_id]
+                                else:
+                                    # The index also holds products of earlier categories
+                                    product = await db_storage.get_product_by_id(product_id)
+                                    if not product:
+                                        logger.warning(f"Product not found for id {product_id}")
+                                        continue
                                     
-                                supplier = await db_storage.get_supplier_by_id(product.supplierId)
+                                    supplier = await db_storage.get_supplier_by_id(product.supplierId)
+                                
                                 if not supplier:
                                     logger.warning(f"Supplier not found for id {product.supplierId}")
                                     continue
@@ -620,11 +666,8 @@ async def match_suppliers_for_rfq(rfq_id: int) -> List[SupplierMatch]:
                                 # Get semantic similarity score
                                 semantic_score = result.get("score", 0.5) * 100
                                 
-                                # Convert to ExtractedRequirement object if needed
-                                req_for_scoring = ensure_extracted_requirement(requirements)
-                                
                                 # Calculate additional match details using traditional approach
-                                match_score, match_details = calculate_match_score(product, supplier, req_for_scoring, category)
+                                match_score, match_details = calculate_match_score(product, supplier, req_obj, category)
                             except (ValueError, TypeError) as e:
                                 logger.error(f"Error processing search result: {str(e)}")
                                 continue
@@ -634,13 +677,7 @@ async def match_suppliers_for_rfq(rfq_id: int) -> List[SupplierMatch]:
                             blended_score = (match_score * 0.7) + (semantic_score * 0.3)
                             
                             # Calculate total price based on quantity
-                            try:
-                                quantity = await get_quantity_for_category(req_for_scoring, category)
-                                total_price = product.price * quantity
-                            except Exception as e:
-                                logger.error(f"Error calculating semantic match quantity: {str(e)}")
-                                quantity = 1
-                                total_price = product.price
+                            total_price = product.price * quantity
                             
                             # Create a supplier match object with blended score
                             supplier_match = SupplierMatch(
@@ -679,27 +716,19 @@ async def match_suppliers_for_rfq(rfq_id: int) -> List[SupplierMatch]:
             
             # Traditional matching approach (used as fallback or if vector search is disabled)
             logger.info(f"Using traditional matching for category {category}")
-            for product in all_products:
-                # Get supplier details
-                supplier = await db_storage.get_supplier_by_id(product.supplierId)
-                
+            for product, supplier in products_with_suppliers:
                 if supplier:
                     try:
-                        # Convert to ExtractedRequirement object if needed
-                        req_for_scoring = ensure_extracted_requirement(requirements)
-                        
                         # Calculate match score based on RFQ criteria
-                        match_score, match_details = calculate_match_score(product, supplier, req_for_scoring, category)
+                        match_score, match_details = calculate_match_score(product, supplier, req_obj, category)
                         
                         # Calculate total price based on quantity
-                        quantity = await get_quantity_for_category(req_for_scoring, category)
                         total_price = product.price * quantity
                     except Exception as e:
                         logger.error(f"Error in traditional matching: {str(e)}")
                         # Use default values if calculation fails
                         match_score = 50.0
                         match_details = {"price": 50.0, "quality": 50.0, "delivery": 50.0}
-                        quantity = 1
                         total_price = product.price
                     
                     # Create a supplier match object
@@ -246,13 +246,13 @@ class VectorService:
                     return False
             
             # Prepare text for embedding
-            text_to_embed = f"{product_data['name']} {product_data['description']} "
+            embed_parts = [f"{product_data['name']} {product_data['description']} "]
             
             # Add specifications to text
             specs = product_data.get('specifications', {})
             if specs:
-                for key, value in specs.items():
-                    text_to_embed += f"{key}: {value} "
+                embed_parts.extend(f"{key}: {value} " for key, value in specs.items())
+            text_to_embed = "".join(embed_parts)
             
             # Get embedding
             embedding = self.get_embedding(text_to_embed)
@@ -477,6 +477,7 @@ class VectorService:
         
         # Initialize search query
         search_query = ""
+        query_parts = []
         
         try:
             # Ensure requirements is a dict
@@ -498,9 +499,9 @@ class VectorService:
             # Build search query from requirements
             # Add title and description
             if "title" in requirements and requirements["title"]:
-                search_query += f"{requirements['title']} "
+                query_parts.append(f"{requirements['title']} ")
             if "description" in requirements and requirements["description"]:
-                search_query += f"{requirements['description']} "
+                query_parts.append(f"{requirements['description']} ")
             
             # Add specific requirements based on category
             if category.lower() == "laptops" and "laptops" in requirements:
@@ -522,15 +523,15 @@ class VectorService:
                 connectivity = laptop_reqs.get('connectivity', '') if isinstance(laptop_reqs, dict) else getattr(laptop_reqs, 'connectivity', '')
                 warranty = laptop_reqs.get('warranty', '') if isinstance(laptop_reqs, dict) else getattr(laptop_reqs, 'warranty', '')
                 
-                search_query += f"processor: {processor} "
-                search_query += f"memory: {memory} "
-                search_query += f"storage: {storage} "
-                search_query += f"display: {display} "
-                search_query += f"battery: {battery} "
-                search_query += f"connectivity: {connectivity} "
-                search_query += f"warranty: {warranty} "
+                query_parts.append(f"processor: {processor} ")
+                query_parts.append(f"memory: {memory} ")
+                query_parts.append(f"storage: {storage} ")
+                query_parts.append(f"display: {display} ")
+                query_parts.append(f"battery: {battery} ")
+                query_parts.append(f"connectivity: {connectivity} ")
+                query_parts.append(f"warranty: {warranty} ")
                 
-                logger.info(f"Built search query for laptop requirements: {search_query[:100]}...")
+                logger.info(f"Built search query for laptop requirements: {''.join(query_parts)[:100]}...")
             
             elif category.lower() == "monitors" and "monitors" in requirements:
                 monitor_reqs = requirements["monitors"]
@@ -551,16 +552,18 @@ class VectorService:
                 connectivity = monitor_reqs.get('connectivity', '') if isinstance(monitor_reqs, dict) else getattr(monitor_reqs, 'connectivity', '')
                 warranty = monitor_reqs.get('warranty', '') if isinstance(monitor_reqs, dict) else getattr(monitor_reqs, 'warranty', '')
                 
-                search_query += f"screen size: {screen_size} "
-                search_query += f"resolution: {resolution} "
-                search_query += f"panel technology: {panel_tech} "
-                search_query += f"brightness: {brightness} "
-                search_query += f"contrast ratio: {contrast_ratio} "
-                search_query += f"connectivity: {connectivity} "
-                search_query += f"warranty: {warranty} "
+                query_parts.append(f"screen size: {screen_size} ")
+                query_parts.append(f"resolution: {resolution} ")
+                query_parts.append(f"panel technology: {panel_tech} ")
+                query_parts.append(f"brightness: {brightness} ")
+                query_parts.append(f"contrast ratio: {contrast_ratio} ")
+                query_parts.append(f"connectivity: {connectivity} ")
+                query_parts.append(f"warranty: {warranty} ")
                 
-                logger.info(f"Built search query for monitor requirements: {search_query[:100]}...")
+                logger.info(f"Built search query for monitor requirements: {''.join(query_parts)[:100]}...")
                 
+            search_query = "".join(query_parts)
+            
             # If we couldn't extract category-specific requirements, add generic product terms
             if not search_query or len(search_query.strip()) < 10:
                 search_query = f"{category} product specifications quality features"
@@ -0,0 +1,294 @@
+"""
+Tests for AI Service
+
+Tests the helpers around the LLM calls including:
+- Parsing of model JSON responses
+- Prompt construction
+- Fallbacks when no AI provider is configured
+"""
+
+import asyncio
+import json
+from collections import OrderedDict
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from ..services import ai_service
+from ..services.ai_service import (
+    _EMAIL_USER_TEMPLATE,
+    _WithDefault,
+    _cache_get,
+    _cache_put,
+    _compact_specs,
+    _get_fallback_requirements,
+    _group_for_batching,
+    _parse_json_response,
+    _payload_key,
+    _trim_rfq,
+    extract_requirements_batch,
+    extract_requirements_from_rfq,
+    generate_email_proposals,
+    get_openai_client,
+)
+
+
+class TestAIService:
+    """Test suite for the AI service helpers"""
+
+    @pytest.fixture(autouse=True)
+    def clear_caches(self):
+        """Keep cached model results from leaking between tests"""
+        ai_service._extraction_cache.clear()
+        ai_service._email_cache.clear()
+        yield
+        ai_service._extraction_cache.clear()
+        ai_service._email_cache.clear()
+
+    def test_parse_json_response_plain(self):
+        """Plain JSON responses parse unchanged"""
+        assert _parse_json_response('{"title": "RFQ"}') == {"title": "RFQ"}
+
+    def test_parse_json_response_fenced(self):
+        """JSON wrapped in a markdown code fence is unwrapped before parsing"""
+        text = '```json\n{"subject": "Hi", "body": "Hello"}\n```'
+        assert _parse_json_response(text) == {"subject": "Hi", "body": "Hello"}
+
+    def test_parse_json_response_invalid(self):
+        """Non-JSON responses raise a ValueError"""
+        with pytest.raises(ValueError):
+            _parse_json_response("Sure! Here are the requirements.")
+
+    def test_compact_specs_allowlist(self):
+        """Only allowlisted specification fields end up in the prompt"""
+        specs = {"processor": "Intel Core i5", "os": "Windows 11 Pro", "memory": "16 GB"}
+        assert _compact_specs(specs) == '{"memory":"16 GB","processor":"Intel Core i5"}'
+
+    def test_compact_specs_non_dict(self):
+        """Missing or malformed specifications produce an empty object"""
+        assert _compact_specs(None) == "{}"
+
+    def test_email_user_template_defaults(self):
+        """Missing RFQ, product and supplier fields render as N/A"""
+        content = _EMAIL_USER_TEMPLATE.format_map({
+            "rfq": _WithDefault({"title": "Laptop refresh"}),
+            "product": _WithDefault({"name": "ThinkPad T14", "price": 1299}),
+            "supplier": _WithDefault(),
+            "specs": "{}",
+        })
+        assert "Title: Laptop refresh" in content
+        assert "Price: $1299" in content
+        assert "Warranty: N/A" in content
+        assert "Contact: N/A" in content
+
+    def test_payload_key_ignores_dict_order(self):
+        """Equal payloads produce the same cache key regardless of key order"""
+        assert _payload_key({"a": 1, "b": 2}) == _payload_key({"b": 2, "a": 1})
+        assert _payload_key({"a": 1}) != _payload_key({"a": 2})
+
+    def test_cache_evicts_least_recently_used(self):
+        """The cache drops the least recently used entry once full"""
+        cache = OrderedDict()
+        _cache_put(cache, "a", 1, maxsize=2)
+        _cache_put(cache, "b", 2, maxsize=2)
+        assert _cache_get(cache, "a") == 1
+        _cache_put(cache, "c", 3, maxsize=2)
+        assert _cache_get(cache, "b") is None
+        assert list(cache) == ["a", "c"]
+
+    @pytest.mark.asyncio
+    async def test_extract_requirements_batch_without_client(self):
+        """Batch extraction returns one result per RFQ when no provider is set"""
+        contents = ["Need 20 laptops with 16GB RAM", "", "Need 10 27-inch monitors"]
+        with patch('python_backend.services.ai_service.get_openai_client', return_value=None):
+            results = await extract_requirements_batch(contents)
+        
+        assert len(results) == 3
+        assert all(r.title == "General Equipment Procurement" for r in results)
+
+    def test_group_for_batching_respects_size(self):
+        """RFQs are grouped by batch size, keeping their order"""
+        assert _group_for_batching(["a" * 20] * 5, batch_size=2) == [[0, 1], [2, 3], [4]]
+
+    def test_group_for_batching_isolates_oversized_rfq(self):
+        """An RFQ larger than the character budget is sent on its own"""
+        contents = ["short rfq text", "x" * 30000, "another rfq"]
+        assert _group_for_batching(contents, batch_size=4) == [[0], [1], [2]]
+
+    @pytest.mark.asyncio
+    async def test_extract_requirements_batch_single_call(self):
+        """A batch of RFQs is extracted with one model call"""
+        results = [
+            {"title": "Laptop refresh", "categories": ["Laptops"], "criteria": {}},
+            {"title": "Monitor upgrade", "categories": ["Monitors"], "criteria": {}},
+        ]
+        response = MagicMock()
+        response.choices[0].message.content = json.dumps({"results": results})
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=response)
+        
+        with patch('python_backend.services.ai_service.get_openai_client', return_value=client):
+            extracted = await extract_requirements_batch(
+                ["Need 20 laptops with 16GB RAM", "Need 10 27-inch monitors"]
+            )
+        
+        assert client.chat.completions.create.call_count == 1
+        assert [r.title for r in extracted] == ["Laptop refresh", "Monitor upgrade"]
+
+    def test_fallback_requirements_use_rfq_title(self):
+        """The fallback keeps the RFQ's own title when it has one"""
+        content = "Request for Quotation\nTitle: Office laptop refresh\nQuantity: 20"
+        assert _get_fallback_requirements(content).title == "Office laptop refresh"
+        assert _get_fallback_requirements("").title == "General Equipment Procurement"
+
+    def test_fallback_requirements_detect_categories(self):
+        """The fallback picks up laptop and monitor RFQs by keyword"""
+        requirements = _get_fallback_requirements("We need 20 Notebooks and 10 external MONITORS")
+        assert requirements.categories == ["Laptops", "Monitors"]
+        assert requirements.laptops is not None
+        assert requirements.monitors is not None
+        
+        generic = _get_fallback_requirements("Office chairs for the new building")
+        assert generic.categories == ["General Equipment"]
+        assert generic.laptops is None
+
+    @pytest.mark.asyncio
+    async def test_generate_email_proposals_preserves_order(self):
+        """Proposal fan-out returns one email per supplier, in input order"""
+        items = [
+            ({"id": 1, "name": "Laptop A"}, {"id": 1, "name": "Supplier One", "contactEmail": "one@example.com"}),
+            ({"id": 2, "name": "Laptop B"}, {"id": 2, "name": "Supplier Two", "contactEmail": "two@example.com"}),
+        ]
+        with patch('python_backend.services.ai_service.get_openai_client', return_value=None):
+            emails = await generate_email_proposals({"title": "Laptop refresh"}, items)
+        
+        assert [e.to for e in emails] == ["one@example.com", "two@example.com"]
+        assert [e.body.rsplit("\n", 1)[-1] for e in emails] == ["Supplier One", "Supplier Two"]
+
+    @pytest.mark.asyncio
+    async def test_extract_requirements_cached_by_content(self):
+        """Repeat and concurrent submissions of one RFQ share a single model call"""
+        response = MagicMock()
+        response.choices[0].message.content = json.dumps(
+            {"title": "Laptop refresh", "categories": ["Laptops"], "criteria": {}}
+        )
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=response)
+        
+        with patch('python_backend.services.ai_service.get_openai_client', return_value=client):
+            first, second = await asyncio.gather(
+                extract_requirements_from_rfq("Need 20 laptops with 16GB RAM"),
+                extract_requirements_from_rfq("  Need 20 laptops with 16GB RAM\n"),
+            )
+            first.title = "Edited by the user"
+            third = await extract_requirements_from_rfq("Need 20 laptops with 16GB RAM")
+        
+        assert client.chat.completions.create.call_count == 1
+        assert second.title == "Laptop refresh"
+        assert third.title == "Laptop refresh"
+
+    @pytest.mark.asyncio
+    async def test_extract_requirements_invalid_json_falls_back(self):
+        """A reply that is not valid requirements JSON yields the fallback"""
+        response = MagicMock()
+        response.choices[0].message.content = '{"title": "Laptop refresh"'
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=response)
+        
+        with patch('python_backend.services.ai_service.get_openai_client', return_value=client):
+            requirements = await extract_requirements_from_rfq("Title: Laptop refresh\nNeed 20 laptops")
+        
+        assert requirements.categories == ["Laptops"]
+        assert not ai_service._extraction_cache
+
+    @pytest.mark.asyncio
+    async def test_extract_requirements_empty_reply_falls_back(self):
+        """A reply with no content (refusal, content filter) or no choices yields the fallback"""
+        refused = MagicMock()
+        refused.choices[0].message.content = None
+        no_choices = MagicMock()
+        no_choices.choices = []
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(side_effect=[refused, no_choices])
+        
+        with patch('python_backend.services.ai_service.get_openai_client', return_value=client):
+            requirements = await extract_requirements_from_rfq("Title: Laptop refresh\nNeed 20 laptops")
+        
+        assert client.chat.completions.create.call_count == 2
+        assert requirements.title == "Laptop refresh"
+        assert requirements.categories == ["Laptops"]
+        assert not ai_service._extraction_cache
+
+    @pytest.mark.asyncio
+    async def test_extract_requirements_escalates_to_strong_model(self):
+        """An unparseable fast-model reply is retried once on the strong model"""
+        bad, good = MagicMock(), MagicMock()
+        bad.choices[0].message.content = "Here are the requirements you asked for"
+        good.choices[0].message.content = json.dumps(
+            {"title": "Laptop refresh", "categories": ["Laptops"], "criteria": {}}
+        )
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(side_effect=[bad, good])
+        
+        with patch('python_backend.services.ai_service.get_openai_client', return_value=client):
+            requirements = await extract_requirements_from_rfq("Need 20 laptops with 16GB RAM")
+        
+        models = [call.kwargs["model"] for call in client.chat.completions.create.call_args_list]
+        assert models == [ai_service.AI_MODEL_FAST, ai_service.AI_MODEL]
+        assert requirements.title == "Laptop refresh"
+
+    def test_trim_rfq_keeps_relevant_paragraphs_in_order(self):
+        """Long RFQs keep the requirement paragraphs, in document order"""
+        intro = "Title: Laptop refresh"
+        boilerplate = "Standard terms and conditions apply. " * 10
+        specs = "Requirements: 20 laptops, 16GB memory, 3 year warranty"
+        content = "\n\n".join([intro, boilerplate, specs])
+        
+        trimmed = _trim_rfq(content, max_chars=len(intro) + len(specs) + 4)
+        assert trimmed == f"{intro}\n\n{specs}"
+        assert _trim_rfq("short RFQ", max_chars=100) == "short RFQ"
+
+    def test_fallback_requirements_are_independent_copies(self):
+        """Editing one fallback result does not leak into the next"""
+        first = _get_fallback_requirements("Need 20 laptops")
+        first.title = "Edited"
+        first.criteria.price["weight"] = 90
+        
+        second = _get_fallback_requirements("Need 20 laptops")
+        assert second.title == "General Equipment Procurement"
+        assert second.criteria.price == {"weight": 40}
+
+    @pytest.mark.asyncio
+    async def test_generate_email_proposals_shares_product_request(self):
+        """Suppliers of one product share a request and duplicate pairs are generated once"""
+        product = {"id": 1, "name": "Laptop A", "price": 999}
+        suppliers = [{"id": n, "name": f"Supplier {n}", "contactEmail": f"s{n}@example.com"} for n in (1, 2, 3)]
+        items = [(product, supplier) for supplier in suppliers] + [(product, suppliers[0])]
+        
+        response = MagicMock()
+        response.choices[0].message.content = json.dumps({
+            "emails": [{"subject": f"Offer {n}", "body": f"Body {n}"} for n in (1, 2, 3)]
+        })
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=response)
+        
+        with patch('python_backend.services.ai_service.get_openai_client', return_value=client):
+            emails = await generate_email_proposals({"title": "Laptop refresh"}, items)
+        
+        assert client.chat.completions.create.call_count == 1
+        assert [e.subject for e in emails] == ["Offer 1", "Offer 2", "Offer 3", "Offer 1"]
+        assert emails[3].to == "s1@example.com"
+
+    def test_openai_client_reused_per_key(self, monkeypatch):
+        """The client is built once per API key and read lazily from the environment"""
+        ai_service._build_openai_client.cache_clear()
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        monkeypatch.setenv("FEATHERLESS_API_KEY", "rc_test_key")
+        
+        client = get_openai_client()
+        assert get_openai_client() is client
+        assert str(client.base_url).startswith(ai_service.FEATHERLESS_BASE_URL)
+        
+        monkeypatch.delenv("FEATHERLESS_API_KEY")
+        assert get_openai_client() is None
+        ai_service._build_openai_client.cache_clear()
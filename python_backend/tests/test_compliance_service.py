@@ -0,0 +1,59 @@
+"""
+Tests for Compliance Service
+
+Tests the website country detection including:
+- Caching of detected countries
+- Retrying websites whose detection failed
+- Not retrying slow websites
+- Matching company names against the sanctions lists
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from ..services.compliance_service import HTTP_SESSION, ComplianceService
+
+
+class TestComplianceService:
+    """Test suite for the compliance service"""
+
+    @pytest.fixture
+    def service(self):
+        """A fresh service, so cached detections do not leak between tests"""
+        return ComplianceService()
+
+    def test_detect_country_from_country_tld(self, service):
+        """A country-code TLD gives the country without fetching the website"""
+        with patch.object(service, '_extract_country_from_content') as extract:
+            assert service.detect_country_from_website("https://www.acme.de") == "Germany"
+        extract.assert_not_called()
+
+    def test_detected_country_is_cached(self, service):
+        """A website's country is looked up once"""
+        with patch.object(service, '_extract_country_from_content', return_value="Germany") as extract:
+            assert service.detect_country_from_website("https://acme.com") == "Germany"
+            assert service.detect_country_from_website("https://acme.com") == "Germany"
+        assert extract.call_count == 1
+
+    def test_failed_detection_is_retried(self, service):
+        """A website whose detection failed, e.g. on a timeout, is fetched again next time"""
+        with patch.object(service, '_extract_country_from_content', side_effect=[None, "Germany"]) as extract:
+            assert service.detect_country_from_website("https://acme.com") is None
+            assert service.detect_country_from_website("https://acme.com") == "Germany"
+        assert extract.call_count == 2
+
+    def test_read_errors_are_not_retried(self):
+        """Failed connects are retried but a read timeout is not, so a slow site costs one timeout"""
+        retries = HTTP_SESSION.get_adapter("https://acme.com").max_retries
+        assert retries.connect is None and retries.total == 2
+        assert retries.read == 0
+
+    def test_entity_sharing_a_start_with_a_longer_entity_is_matched(self):
+        """Both lists match when one sanctioned name starts the other"""
+        sanctions_lists = {"US": ["Acme Technologies"], "EU": ["ACME"]}
+        with patch.object(ComplianceService, '_load_sanctions_lists', return_value=sanctions_lists):
+            service = ComplianceService()
+        
+        assert service.check_sanctions_list("Acme Technologies Co., Ltd.") == ["US", "EU"]
+        assert service.check_sanctions_list("Acme Robotics") == ["EU"]
@@ -0,0 +1,139 @@
+"""
+Tests for Product Scraper
+
+Tests the page fetching including:
+- Reuse of cached pages the server reports unchanged
+- Caching only pages the server sent validators for
+- Refetching pages whose cache entry is corrupt
+- Truncation of oversized pages
+- Writing of product files
+- Rejection of scrapers that cannot extract products
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from ..services import product_scraper
+from ..services.product_scraper import (
+    MAX_PAGE_BYTES,
+    NvidiaProductScraper,
+    ProductScraper,
+    save_json_products,
+)
+
+URL = "https://example.com/product"
+
+
+def make_response(status_code=200, body=b"", headers=None, encoding=None):
+    """A streamed response usable as a context manager"""
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.encoding = encoding
+    response.iter_content.side_effect = lambda chunk_size: (
+        body[i:i + chunk_size] for i in range(0, len(body), chunk_size)
+    )
+    return response
+
+
+class TestProductScraper:
+    """Test suite for the scraper base class"""
+
+    def test_scraper_without_extract_product_info_cannot_be_created(self):
+        """A subclass missing extract_product_info fails when created, not mid-scrape"""
+        class IncompleteScraper(ProductScraper):
+            pass
+        
+        with pytest.raises(TypeError):
+            IncompleteScraper()
+
+
+class TestGetPage:
+    """Test suite for fetching pages through the page cache"""
+
+    @pytest.fixture(autouse=True)
+    def page_cache_dir(self, tmp_path, monkeypatch):
+        """Keep the page cache out of the data directory"""
+        monkeypatch.setattr(product_scraper, 'PAGE_CACHE_DIR', str(tmp_path))
+        return tmp_path
+
+    @pytest.fixture
+    def scraper(self):
+        scraper = NvidiaProductScraper()
+        scraper.session = MagicMock()
+        return scraper
+
+    def test_unchanged_page_reuses_cached_body_and_encoding(self, scraper):
+        """A 304 is answered from the stored body, decoded with the stored charset"""
+        body = "<h1>Café</h1>".encode('latin-1')
+        scraper.session.get.return_value = make_response(
+            body=body,
+            headers={'ETag': '"v1"', 'Content-Type': 'text/html; charset=ISO-8859-1'},
+            encoding='ISO-8859-1',
+        )
+        assert scraper.get_page(URL).h1.text == "Café"
+        
+        scraper.session.get.return_value = make_response(status_code=304)
+        soup = scraper.get_page(URL)
+        
+        assert soup.h1.text == "Café"
+        assert scraper.session.get.call_args.kwargs['headers'] == {'If-None-Match': '"v1"'}
+
+    def test_page_without_validators_is_not_cached(self, scraper, page_cache_dir):
+        """Without an ETag or Last-Modified the page is not stored or revalidated"""
+        scraper.session.get.return_value = make_response(body=b"<h1>GPU</h1>")
+        scraper.get_page(URL)
+        scraper.get_page(URL)
+        
+        assert list(page_cache_dir.iterdir()) == []
+        assert scraper.session.get.call_args.kwargs['headers'] == {}
+
+    @pytest.mark.parametrize("metadata", ["{not json", "[]"])
+    def test_corrupt_cache_entry_is_refetched(self, scraper, metadata):
+        """A cache entry that cannot be read is ignored and the page fetched in full"""
+        path = scraper._cached_page_path(URL)
+        with open(path + '.json', 'w') as f:
+            f.write(metadata)
+        with open(path + '.html', 'wb') as f:
+            f.write(b"<h1>Stale</h1>")
+        scraper.session.get.return_value = make_response(
+            body=b"<h1>Fresh</h1>", headers={'ETag': '"v2"'}
+        )
+        
+        assert scraper.get_page(URL).h1.text == "Fresh"
+        assert scraper.session.get.call_args.kwargs['headers'] == {}
+        assert scraper._load_cached_page(URL)["etag"] == '"v2"'
+
+    def test_oversized_page_is_truncated(self, scraper):
+        """Downloading stops at the size cap and the partial page is still parsed"""
+        body = b"<h1>GPU</h1>" + b"<p>spec</p>" * (MAX_PAGE_BYTES // 8)
+        response = make_response(body=body, headers={'ETag': '"v1"'})
+        scraper.session.get.return_value = response
+        
+        assert scraper.get_page(URL).h1.text == "GPU"
+        assert len(scraper._load_cached_page(URL)["body"]) == MAX_PAGE_BYTES
+
+
+class TestSaveJsonProducts:
+    """Test suite for the streamed product file writer"""
+
+    @pytest.mark.parametrize("products, metadata", [
+        ([], {"lastUpdated": "2024-01-01T00:00:00"}),
+        ([{"name": "RTX 4090", "price": 1599.0}], {"lastUpdated": "2024-01-01T00:00:00"}),
+        (
+            [
+                {"name": "RTX 4090", "specifications": {"memory": "24 GB", "ports": ["HDMI", "DP"]}},
+                {"name": "RX 7900 XTX", "specifications": {}},
+            ],
+            {"lastUpdated": "2024-01-01T00:00:00", "sources": {"nvidia": 1, "amd": [1, {"ok": True}]}, "errors": []},
+        ),
+    ], ids=["empty", "one-product", "nested-metadata"])
+    def test_matches_json_dumps(self, tmp_path, products, metadata):
+        """The file is byte-for-byte what json.dumps writes for the whole document"""
+        filename = tmp_path / "products.json"
+        save_json_products(str(filename), products, metadata)
+        
+        assert filename.read_text() == json.dumps({"products": products, **metadata}, indent=2)